@@ -4,15 +4,23 @@ Advanced NLP Feature Extraction Script for NeuroAid
 Extracts comprehensive linguistic features for cognitive health analysis
 """
 
+import os
 import sys
 import json
 import re
 import math
-from collections import Counter, defaultdict
-from typing import Dict, List, Any, Tuple
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Tuple, Iterator
 
 try:
+    import numpy as np
     import spacy
+    from spacy.attrs import POS, DEP, HEAD, LEMMA, LOWER, LENGTH, IS_ALPHA, IS_STOP, IS_SPACE, ENT_IOB, ENT_TYPE
+    from spacy.strings import StringStore
     import nltk
     from nltk.corpus import stopwords
     from nltk.tokenize import sent_tokenize, word_tokenize
@@ -20,259 +28,636 @@ try:
     from nltk.chunk import ne_chunk
     from nltk.tree import Tree
     from nltk.sentiment import SentimentIntensityAnalyzer
-    from textstat import flesch_reading_ease, flesch_kincaid_grade, automated_readability_index
-    from textstat import coleman_liau_index, gunning_fog, smog_index, linsear_write_formula
+    from textstat import lexicon_count, sentence_count, syllable_count, char_count, letter_count, polysyllabcount
+    from textstat import gunning_fog, linsear_write_formula
 except ImportError as e:
     print(json.dumps({"error": f"Missing required package: {e}"}))
     sys.exit(1)
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        return lambda func: func
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize obj to a JSON string, optionally indented by two spaces"""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+else:
+    _loads = json.loads
+    
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize obj to a JSON string, optionally indented by two spaces"""
+        return json.dumps(obj, indent=2 if indent else None)
+
+@njit(cache=True)
+def _repetition_kernel(word_ids):
+    """Count immediate (next word) and near (2-3 words later) repetitions"""
+    immediate = 0
+    near = 0
+    n = word_ids.shape[0]
+    for i in range(n - 1):
+        if word_ids[i] == word_ids[i + 1]:
+            immediate += 1
+        for j in range(i + 2, min(i + 4, n)):
+            if word_ids[i] == word_ids[j]:
+                near += 1
+    return immediate, near
+
+@njit(cache=True)
+def _connectivity_kernel(pos, sent_starts, sent_ends, pron_id, det_id):
+    """Mean share of pronoun/determiner tokens over every sentence after the first"""
+    n_sents = sent_starts.shape[0]
+    score = 0.0
+    for s in range(1, n_sents):
+        linking = 0
+        for i in range(sent_starts[s], sent_ends[s]):
+            if pos[i] == pron_id or pos[i] == det_id:
+                linking += 1
+        score += linking / (sent_ends[s] - sent_starts[s])
+    return score / (n_sents - 1)
+
+# Text normalization patterns used by _clean_text
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.,!?;:\'"()-]')
+
+# Consonant clusters treated as hard to articulate (matched against lowercased words)
+ARTICULATION_RE = re.compile(r'str|spr|thr|scr')
+
+# Word lists used by the discourse, cognitive and semantic extractors
+DISCOURSE_MARKERS = frozenset([
+    'however', 'therefore', 'moreover', 'furthermore', 'nevertheless',
+    'consequently', 'meanwhile', 'additionally', 'similarly', 'conversely'
+])
+HESITATION_MARKERS = frozenset(['um', 'uh', 'er', 'ah', 'hmm', 'well', 'you know', 'like'])
+PEOPLE_WORDS = frozenset(['person', 'people', 'man', 'woman', 'child'])
+PLACE_WORDS = frozenset(['house', 'home', 'building', 'room'])
+TRANSPORT_WORDS = frozenset(['car', 'bike', 'plane', 'train'])
+
+# spaCy string IDs are the shared symbol IDs or content hashes, identical across vocabs
+_STRING_IDS = StringStore()
+
+def _string_ids(labels) -> np.ndarray:
+    """Map string labels to the uint64 IDs used in Doc.to_array output"""
+    return np.array([_STRING_IDS.add(label) for label in labels], dtype=np.uint64)
+
+# Dependency labels counted as clauses by the syntactic/complexity extractors
+CLAUSE_DEP_IDS = _string_ids(['ccomp', 'xcomp', 'advcl', 'acl', 'relcl'])
+EMBEDDED_CLAUSE_DEP_IDS = _string_ids(['ccomp', 'xcomp', 'advcl'])
+DEMANDING_CLAUSE_DEP_IDS = _string_ids(['ccomp', 'xcomp', 'advcl', 'relcl'])
+PASSIVE_DEP_IDS = _string_ids(['auxpass', 'nsubjpass'])
+MARK_ID, CC_ID, NSUBJ_ID, DOBJ_ID, POBJ_ID = _string_ids(['mark', 'cc', 'nsubj', 'dobj', 'pobj'])
+
+# Parts of speech used by the extractors; content words are nouns, verbs, adjectives, adverbs
+CONTENT_POS_IDS = _string_ids(['NOUN', 'VERB', 'ADJ', 'ADV'])
+NOUN_ID, VERB_ID, PRON_ID, DET_ID = _string_ids(['NOUN', 'VERB', 'PRON', 'DET'])
+
+# Word lists as string IDs, compared against the LEMMA/LOWER columns
+DISCOURSE_MARKER_IDS = _string_ids(DISCOURSE_MARKERS)
+HESITATION_MARKER_IDS = _string_ids(HESITATION_MARKERS)
+PEOPLE_WORD_IDS = _string_ids(PEOPLE_WORDS)
+PLACE_WORD_IDS = _string_ids(PLACE_WORDS)
+TRANSPORT_WORD_IDS = _string_ids(TRANSPORT_WORDS)
+
+if NUMBA_AVAILABLE:
+    # Compile on import so the first document doesn't pay JIT latency
+    _repetition_kernel(np.zeros(1, np.uint64))
+    _connectivity_kernel(np.zeros(2, np.uint64), np.arange(2), np.arange(1, 3), PRON_ID, DET_ID)
+
+# Columns requested from Doc.to_array, in order
+DOC_ATTRS = [POS, DEP, HEAD, LEMMA, LOWER, LENGTH, IS_ALPHA, IS_STOP, IS_SPACE, ENT_IOB, ENT_TYPE]
+
+# ENT_IOB value marking the first token of an entity
+ENT_BEGIN = 3
+
+def _tree_depths(head_offsets: np.ndarray) -> np.ndarray:
+    """Depth of every token below its sentence root, from Doc.to_array HEAD offsets
+    
+    Walks all tokens up one level per iteration, so the loop runs once per tree
+    level rather than once per token.
+    """
+    positions = np.arange(head_offsets.size, dtype=np.int64)
+    heads = positions + head_offsets.view(np.int64)
+    depth = np.zeros(head_offsets.size, dtype=np.int32)
+    current = positions
+    active = heads != positions
+    while active.any():
+        depth += active
+        current = heads[current]
+        active = heads[current] != current
+    return depth
+
+def _first_seen_counts(values: np.ndarray) -> Dict[Any, int]:
+    """Count values, keyed in order of first occurrence (the order Counter would use)"""
+    if values.size == 0:
+        return {}
+    unique_values, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first_index, kind='stable')
+    return dict(zip(unique_values[order].tolist(), counts[order].tolist()))
+
+def _label_count(counts: Dict[int, int], ids) -> int:
+    """Total count of tokens whose label ID is one of ids"""
+    return sum(counts.get(int(label), 0) for label in np.atleast_1d(ids))
+
+def _sentence_sums(mask: np.ndarray, sent_starts: np.ndarray) -> np.ndarray:
+    """Per-sentence totals of a token mask; sentences tile the doc, so each segment runs to the next start"""
+    if sent_starts.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(mask.astype(np.int64), sent_starts)
+
+@dataclass
+class DocContext:
+    """Columnar token attributes of a parsed doc, built once from Doc.to_array and shared by every extractor"""
+    pos: np.ndarray
+    dep: np.ndarray
+    lemma: np.ndarray
+    lower: np.ndarray
+    length: np.ndarray
+    is_alpha: np.ndarray
+    is_stop: np.ndarray
+    is_space: np.ndarray
+    tree_depth: np.ndarray
+    lemma_lower: np.ndarray
+    pos_freq: Dict[str, int]
+    alpha_pos_freq: Dict[str, int]
+    dep_counts: Dict[int, int]
+    dep_freq: Dict[str, int]
+    lemma_freq: Counter
+    length_freq: Dict[int, int]
+    entity_freq: Dict[str, int]
+    entity_count: int
+    sents: Tuple
+    n_sents: int
+    sent_starts: np.ndarray
+    sent_ends: np.ndarray
+    sent_tree_depths: np.ndarray
+    word_count: int
+    content_word_count: int
+    alpha_length_total: int
+    long_word_count: int
+    token_count: int
+
+# spaCy pipeline components consumed by the full feature set: tok2vec feeds the
+# tagger/parser, POS comes from tagger + attribute_ruler, lemmas from the
+# lemmatizer, dependencies and sentence boundaries from the parser, entities from ner
+SPACY_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+# Smallest batch parsed with a spaCy process pool: each pool reloads the model, which
+# only pays off once every process gets at least two nlp.pipe batches (batch_size=64)
+MULTIPROCESS_MIN_BATCH = 128
+
+# Texts shorter than this are scored through a memoized VADER call; short
+# utterances ("yes", "okay", "I don't know") repeat heavily across transcripts
+SHORT_TEXT_CHARS = 32
+
+# Entity detail in the output: "counts" keeps aggregate counts and a short preview
+# of entity spans, "full" lists every entity
+DETAIL_LEVELS = ("counts", "full")
+ENTITY_PREVIEW_LIMIT = 10
+TEMPORAL_LABELS = frozenset(['DATE', 'TIME', 'EVENT'])
+
+# NLTK datasets and their resource paths under an nltk_data directory
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'stopwords': 'corpora/stopwords',
+    'vader_lexicon': 'sentiment/vader_lexicon',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words'
+}
+
+_nltk_data_ready = False
+
+def ensure_nltk_data():
+    """Download any missing NLTK datasets, checking the data directories once per process"""
+    global _nltk_data_ready
+    if _nltk_data_ready:
+        return
+    
+    for dataset, resource in NLTK_RESOURCES.items():
+        installed = any(
+            os.path.exists(os.path.join(root, resource)) or os.path.exists(os.path.join(root, resource + '.zip'))
+            for root in nltk.data.path
+        )
+        if not installed:
+            nltk.download(dataset, quiet=True)
+    
+    _nltk_data_ready = True
+
 class NLPFeatureExtractor:
     """Comprehensive NLP feature extraction for cognitive health analysis"""
     
-    def __init__(self, spacy_model: str = "en_core_web_sm"):
-        """Initialize the NLP analyzer with required models"""
-        try:
-            # Load spaCy model
-            self.nlp = spacy.load(spacy_model)
-            
-            # Download required NLTK data
-            nltk_downloads = [
-                'punkt', 'averaged_perceptron_tagger', 'stopwords',
-                'vader_lexicon', 'maxent_ne_chunker', 'words'
-            ]
-            
-            for dataset in nltk_downloads:
-                try:
-                    nltk.data.find(f'tokenizers/{dataset}')
-                except LookupError:
-                    nltk.download(dataset, quiet=True)
-            
-            # Initialize components
-            self.stop_words = set(stopwords.words('english'))
-            self.sia = SentimentIntensityAnalyzer()
-            
-        except Exception as e:
-            print(json.dumps({"error": f"Failed to initialize NLP models: {e}"}))
-            sys.exit(1)
+    def __init__(self, spacy_model: str = "en_core_web_sm", fast: bool = False):
+        """Initialize the NLP analyzer; models are loaded on first use
+        
+        fast=True skips the spaCy pipeline entirely and only extracts the
+        string-based readability and sentiment features
+        """
+        self.fast = fast
+        self._spacy_model = spacy_model
+        self._nlp = None
+        self._model_name = None
+        self._sia = None
+        self._stop_words = None
+        self._short_text_scores = lru_cache(maxsize=4096)(self._polarity_scores)
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access (tokenizer only in fast mode)"""
+        if self._nlp is None:
+            # exclude (unlike disable) skips deserializing the components' weights
+            self._nlp = spacy.load(self._spacy_model, exclude=SPACY_PIPES if self.fast else [])
+        return self._nlp
+    
+    @property
+    def model_name(self) -> str:
+        """Name of the loaded spaCy model, read from its meta once"""
+        if self._model_name is None:
+            self._model_name = self.nlp.meta["name"]
+        return self._model_name
     
-    def extract_features(self, text: str, metadata: Dict = None) -> Dict[str, Any]:
-        """Extract comprehensive NLP features from text"""
+    @property
+    def sia(self) -> SentimentIntensityAnalyzer:
+        """VADER sentiment analyzer, created on first access"""
+        if self._sia is None:
+            ensure_nltk_data()
+            sia = SentimentIntensityAnalyzer()
+            # First call compiles VADER's regexes and touches the lexicon
+            sia.polarity_scores("warm up")
+            self._sia = sia
+        return self._sia
+    
+    @property
+    def stop_words(self) -> set:
+        """NLTK English stop words, loaded on first access"""
+        if self._stop_words is None:
+            ensure_nltk_data()
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+    
+    def extract_features(self, text: str, metadata: Dict = None, detail_level: str = "counts") -> Dict[str, Any]:
+        """Extract comprehensive NLP features from text
+        
+        detail_level="full" lists every named and temporal entity; the default
+        "counts" only keeps the first ENTITY_PREVIEW_LIMIT of each
+        """
         try:
             if not text or not text.strip():
                 return {"error": "Empty or invalid text provided"}
             
+            if detail_level not in DETAIL_LEVELS:
+                return {"error": f"Unknown detail level: {detail_level}"}
+            
             # Clean and preprocess text
             cleaned_text = self._clean_text(text)
             
+            if self.fast:
+                return self._build_fast_features(text, cleaned_text, metadata)
+            
             # Process with spaCy
             doc = self.nlp(cleaned_text)
             
-            # Extract all feature categories
-            features = {
-                "basic_stats": self._extract_basic_stats(text, doc),
-                "lexical_features": self._extract_lexical_features(text, doc),
-                "syntactic_features": self._extract_syntactic_features(doc),
-                "semantic_features": self._extract_semantic_features(doc),
-                "discourse_features": self._extract_discourse_features(text, doc),
-                "readability_features": self._extract_readability_features(text),
-                "cognitive_indicators": self._extract_cognitive_indicators(text, doc),
-                "speech_patterns": self._extract_speech_patterns(text, doc, metadata),
-                "sentiment_analysis": self._extract_sentiment_features(text),
-                "named_entities": self._extract_named_entities(doc),
-                "temporal_features": self._extract_temporal_features(doc),
-                "complexity_metrics": self._extract_complexity_metrics(text, doc)
-            }
+            return self._build_features(text, cleaned_text, doc, metadata, detail_level)
+            
+        except Exception as e:
+            return {"error": f"Feature extraction failed: {str(e)}"}
+    
+    def extract_features_batch(self, texts: List[str], metadatas: List[Dict] = None, detail_level: str = "counts",
+                               batch_size: int = 64, n_process: int = 1) -> Iterator[Dict[str, Any]]:
+        """Extract features for many texts, parsing them together with nlp.pipe
+        
+        Yields one result per input text, in input order
+        """
+        if metadatas is None:
+            metadatas = [None] * len(texts)
+        
+        if self.fast or detail_level not in DETAIL_LEVELS:
+            for text, metadata in zip(texts, metadatas):
+                yield self.extract_features(text, metadata, detail_level)
+            return
+        
+        # Invalid texts are reported by extract_features and never reach the pipeline
+        valid = [isinstance(text, str) and bool(text.strip()) for text in texts]
+        cleaned_texts = [self._clean_text(text) for text, ok in zip(texts, valid) if ok]
+        docs = self.nlp.pipe(cleaned_texts, batch_size=batch_size, n_process=n_process)
+        cleaned_iter = iter(cleaned_texts)
+        
+        for text, metadata, ok in zip(texts, metadatas, valid):
+            if not ok:
+                yield self.extract_features(text, metadata, detail_level)
+                continue
             
-            # Add metadata
-            features["metadata"] = {
+            cleaned_text = next(cleaned_iter)
+            try:
+                yield self._build_features(text, cleaned_text, next(docs), metadata, detail_level)
+            except Exception as e:
+                yield {"error": f"Feature extraction failed: {str(e)}"}
+    
+    def _build_fast_features(self, text: str, cleaned_text: str, metadata: Dict = None) -> Dict[str, Any]:
+        """String-only features; no spaCy pipeline run"""
+        return {
+            "readability_features": self._extract_readability_features(text),
+            "sentiment_analysis": self._extract_sentiment_features(text),
+            "metadata": {
                 "text_length": len(text),
                 "processed_length": len(cleaned_text),
                 "processing_timestamp": metadata.get("timestamp") if metadata else None,
-                "spacy_model": self.nlp.meta["name"],
-                "language": doc.lang_
+                "spacy_model": self.model_name,
+                "language": self.nlp.lang
             }
-            
-            return features
-            
-        except Exception as e:
-            return {"error": f"Feature extraction failed: {str(e)}"}
+        }
+    
+    def _build_features(self, text: str, cleaned_text: str, doc, metadata: Dict = None,
+                        detail_level: str = "counts") -> Dict[str, Any]:
+        """Extract every feature category from an already parsed doc"""
+        # Collect per-token attributes once for all extractors
+        ctx = self._materialize(doc)
+        
+        # Extract all feature categories
+        features = {
+            "basic_stats": self._extract_basic_stats(text, doc, ctx),
+            "lexical_features": self._extract_lexical_features(text, ctx),
+            "syntactic_features": self._extract_syntactic_features(doc, ctx),
+            "semantic_features": self._extract_semantic_features(doc, ctx),
+            "discourse_features": self._extract_discourse_features(text, doc, ctx),
+            "readability_features": self._extract_readability_features(text),
+            "cognitive_indicators": self._extract_cognitive_indicators(text, doc, ctx),
+            "speech_patterns": self._extract_speech_patterns(text, doc, ctx, metadata),
+            "sentiment_analysis": self._extract_sentiment_features(text),
+            "named_entities": self._extract_named_entities(doc, ctx, detail_level),
+            "temporal_features": self._extract_temporal_features(doc, ctx, detail_level),
+            "complexity_metrics": self._extract_complexity_metrics(text, doc, ctx)
+        }
+        
+        # Add metadata
+        features["metadata"] = {
+            "text_length": len(text),
+            "processed_length": len(cleaned_text),
+            "processing_timestamp": metadata.get("timestamp") if metadata else None,
+            "spacy_model": self.model_name,
+            "language": self.nlp.lang
+        }
+        
+        return features
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text for processing"""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s\.,!?;:\'"()-]', '', text)
+        text = SPECIAL_CHARS_RE.sub('', text)
         return text.strip()
     
-    def _extract_basic_stats(self, text: str, doc) -> Dict[str, Any]:
+    def _materialize(self, doc) -> DocContext:
+        """Export every token attribute the extractors need in a single Doc.to_array call"""
+        arr = doc.to_array(DOC_ATTRS)
+        # One contiguous row per attribute, so the columns can be passed straight to the kernels
+        pos, dep, head, lemma, lower, length, is_alpha, is_stop, is_space, ent_iob, ent_type = np.ascontiguousarray(arr.T)
+        is_alpha = is_alpha.astype(bool)
+        is_stop = is_stop.astype(bool)
+        is_space = is_space.astype(bool)
+        length = length.astype(np.int64)
+        
+        strings = doc.vocab.strings
+        unique_lemmas, inverse = np.unique(lemma, return_inverse=True)
+        lowered_ids = np.array([strings.add(strings[int(i)].lower()) for i in unique_lemmas], dtype=np.uint64)
+        lemma_lower = lowered_ids[inverse.reshape(-1)]
+        content_mask = is_alpha & ~is_stop
+        
+        pos_freq = {strings[tag]: count for tag, count in _first_seen_counts(pos).items()}
+        alpha_pos_freq = {strings[tag]: count for tag, count in _first_seen_counts(pos[is_alpha]).items()}
+        dep_counts = _first_seen_counts(dep)
+        dep_freq = {strings[label]: count for label, count in dep_counts.items()}
+        alpha_lengths = length[is_alpha]
+        length_bins = np.bincount(alpha_lengths)
+        entity_labels = ent_type[ent_iob == ENT_BEGIN]
+        sents = tuple(doc.sents)
+        sent_starts = np.array([sent.start for sent in sents], dtype=np.int64)
+        tree_depth = _tree_depths(head)
+        
+        return DocContext(
+            pos=pos,
+            dep=dep,
+            lemma=lemma,
+            lower=lower,
+            length=length,
+            is_alpha=is_alpha,
+            is_stop=is_stop,
+            is_space=is_space,
+            tree_depth=tree_depth,
+            lemma_lower=lemma_lower,
+            pos_freq=pos_freq,
+            alpha_pos_freq=alpha_pos_freq,
+            dep_counts=dep_counts,
+            dep_freq=dep_freq,
+            lemma_freq=Counter({strings[i]: count for i, count in _first_seen_counts(lemma_lower[content_mask]).items()}),
+            length_freq={length: int(length_bins[length]) for length in np.flatnonzero(length_bins).tolist()},
+            entity_freq={strings[label]: count for label, count in _first_seen_counts(entity_labels).items()},
+            entity_count=int(entity_labels.size),
+            sents=sents,
+            n_sents=len(sents),
+            sent_starts=sent_starts,
+            sent_ends=np.array([sent.end for sent in sents], dtype=np.int64),
+            sent_tree_depths=np.maximum.reduceat(tree_depth, sent_starts) if sents else np.zeros(0, dtype=np.int32),
+            word_count=int(np.count_nonzero(is_alpha)),
+            content_word_count=int(np.count_nonzero(content_mask)),
+            alpha_length_total=int(alpha_lengths.sum()),
+            long_word_count=int(np.count_nonzero(alpha_lengths > 6)),
+            token_count=int(np.count_nonzero(~is_space))
+        )
+    
+    def _extract_basic_stats(self, text: str, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract basic text statistics"""
-        sentences = list(doc.sents)
-        tokens = [token for token in doc if not token.is_space]
-        words = [token for token in doc if token.is_alpha]
+        n_sents = ctx.n_sents
+        word_count = ctx.word_count
         
         return {
             "character_count": len(text),
-            "word_count": len(words),
-            "sentence_count": len(sentences),
-            "token_count": len(tokens),
-            "avg_word_length": sum(len(token.text) for token in words) / len(words) if words else 0,
-            "avg_sentence_length": len(words) / len(sentences) if sentences else 0,
-            "type_token_ratio": len(set(token.lemma_.lower() for token in words)) / len(words) if words else 0
+            "word_count": word_count,
+            "sentence_count": n_sents,
+            "token_count": ctx.token_count,
+            "avg_word_length": ctx.alpha_length_total / word_count if word_count else 0,
+            "avg_sentence_length": word_count / n_sents if n_sents else 0,
+            "type_token_ratio": np.unique(ctx.lemma_lower[ctx.is_alpha]).size / word_count if word_count else 0
         }
     
-    def _extract_lexical_features(self, text: str, doc) -> Dict[str, Any]:
+    def _extract_lexical_features(self, text: str, ctx: DocContext) -> Dict[str, Any]:
         """Extract lexical diversity and vocabulary features"""
-        words = [token.lemma_.lower() for token in doc if token.is_alpha and not token.is_stop]
-        all_words = [token.lemma_.lower() for token in doc if token.is_alpha]
-        
-        word_freq = Counter(words)
-        pos_tags = [token.pos_ for token in doc if token.is_alpha]
-        pos_freq = Counter(pos_tags)
+        word_freq = ctx.lemma_freq
         
         # Lexical diversity measures
-        unique_words = len(set(words))
-        total_words = len(words)
+        unique_words = len(word_freq)
+        total_words = ctx.content_word_count
+        all_words = ctx.word_count
+        hapax_count = list(word_freq.values()).count(1)
         
         return {
             "vocabulary_size": unique_words,
             "lexical_diversity": unique_words / total_words if total_words > 0 else 0,
-            "hapax_legomena": sum(1 for count in word_freq.values() if count == 1),
-            "hapax_ratio": sum(1 for count in word_freq.values() if count == 1) / total_words if total_words > 0 else 0,
-            "content_word_ratio": len(words) / len(all_words) if all_words else 0,
-            "function_word_ratio": (len(all_words) - len(words)) / len(all_words) if all_words else 0,
-            "pos_distribution": dict(pos_freq),
+            "hapax_legomena": hapax_count,
+            "hapax_ratio": hapax_count / total_words if total_words > 0 else 0,
+            "content_word_ratio": total_words / all_words if all_words else 0,
+            "function_word_ratio": (all_words - total_words) / all_words if all_words else 0,
+            "pos_distribution": dict(ctx.alpha_pos_freq),
             "most_frequent_words": dict(word_freq.most_common(10)),
-            "word_length_distribution": self._get_word_length_distribution(doc)
+            "word_length_distribution": self._get_word_length_distribution(ctx)
         }
     
-    def _extract_syntactic_features(self, doc) -> Dict[str, Any]:
+    def _extract_syntactic_features(self, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract syntactic complexity features"""
-        sentences = list(doc.sents)
-        
-        # Dependency parsing features
-        dep_labels = [token.dep_ for token in doc]
-        dep_freq = Counter(dep_labels)
+        n_sents = ctx.n_sents
+        dep_freq = ctx.dep_freq
         
         # Tree depth and complexity
-        tree_depths = []
-        clause_counts = []
+        tree_depths = ctx.sent_tree_depths
         
-        for sent in sentences:
-            depth = self._calculate_tree_depth(sent.root)
-            tree_depths.append(depth)
-            
-            # Count clauses (simplified)
-            clause_count = sum(1 for token in sent if token.dep_ in ['ccomp', 'xcomp', 'advcl', 'acl', 'relcl'])
-            clause_counts.append(clause_count)
+        # Count clauses (simplified); every sentence's clauses are in the doc-wide count
+        clause_count = _label_count(ctx.dep_counts, CLAUSE_DEP_IDS)
         
         return {
-            "avg_tree_depth": sum(tree_depths) / len(tree_depths) if tree_depths else 0,
-            "max_tree_depth": max(tree_depths) if tree_depths else 0,
-            "avg_clauses_per_sentence": sum(clause_counts) / len(clause_counts) if clause_counts else 0,
+            "avg_tree_depth": int(tree_depths.sum()) / n_sents if n_sents else 0,
+            "max_tree_depth": int(tree_depths.max()) if n_sents else 0,
+            "avg_clauses_per_sentence": clause_count / n_sents if n_sents else 0,
             "dependency_distribution": dict(dep_freq),
-            "subordination_ratio": dep_freq.get('mark', 0) / len(sentences) if sentences else 0,
-            "coordination_ratio": dep_freq.get('cc', 0) / len(sentences) if sentences else 0,
-            "passive_voice_ratio": self._calculate_passive_ratio(doc)
+            "subordination_ratio": _label_count(ctx.dep_counts, MARK_ID) / n_sents if n_sents else 0,
+            "coordination_ratio": _label_count(ctx.dep_counts, CC_ID) / n_sents if n_sents else 0,
+            "passive_voice_ratio": self._calculate_passive_ratio(ctx)
         }
     
-    def _extract_semantic_features(self, doc) -> Dict[str, Any]:
+    def _extract_semantic_features(self, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract semantic and meaning-related features"""
         # Semantic similarity and coherence measures would go here
         # For now, we'll extract basic semantic features
         
-        entities = [ent.label_ for ent in doc.ents]
-        entity_freq = Counter(entities)
-        
         return {
-            "entity_count": len(doc.ents),
-            "entity_types": dict(entity_freq),
-            "entity_density": len(doc.ents) / len([token for token in doc if token.is_alpha]) if doc else 0,
-            "semantic_roles": self._extract_semantic_roles(doc)
+            "entity_count": ctx.entity_count,
+            "entity_types": dict(ctx.entity_freq),
+            "entity_density": ctx.entity_count / ctx.word_count if doc else 0,
+            "semantic_roles": self._extract_semantic_roles(ctx)
         }
     
-    def _extract_discourse_features(self, text: str, doc) -> Dict[str, Any]:
+    def _extract_discourse_features(self, text: str, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract discourse and coherence features"""
-        sentences = list(doc.sents)
-        
-        # Discourse markers
-        discourse_markers = [
-            'however', 'therefore', 'moreover', 'furthermore', 'nevertheless',
-            'consequently', 'meanwhile', 'additionally', 'similarly', 'conversely'
-        ]
-        
-        marker_count = sum(1 for token in doc if token.lemma_.lower() in discourse_markers)
+        marker_count = int(np.count_nonzero(np.isin(ctx.lemma_lower, DISCOURSE_MARKER_IDS)))
         
         # Pronoun usage (cohesion indicator)
-        pronouns = [token for token in doc if token.pos_ == 'PRON']
+        pronoun_count = ctx.pos_freq.get('PRON', 0)
         
         return {
             "discourse_marker_count": marker_count,
-            "discourse_marker_ratio": marker_count / len(sentences) if sentences else 0,
-            "pronoun_count": len(pronouns),
-            "pronoun_ratio": len(pronouns) / len([token for token in doc if token.is_alpha]) if doc else 0,
-            "sentence_connectivity": self._calculate_sentence_connectivity(sentences)
+            "discourse_marker_ratio": marker_count / ctx.n_sents if ctx.n_sents else 0,
+            "pronoun_count": pronoun_count,
+            "pronoun_ratio": pronoun_count / ctx.word_count if doc else 0,
+            "sentence_connectivity": self._calculate_sentence_connectivity(ctx)
         }
     
     def _extract_readability_features(self, text: str) -> Dict[str, Any]:
-        """Extract readability and complexity scores"""
+        """Extract readability and complexity scores
+        
+        Flesch, Flesch-Kincaid, ARI, Coleman-Liau and SMOG use textstat's formulas on
+        counts taken once; Gunning Fog and Linsear Write need textstat's word lists
+        """
         try:
+            words = lexicon_count(text, removepunct=True)
+            raw_words = lexicon_count(text, removepunct=False)
+            sentences = sentence_count(text)
+            syllables = syllable_count(text)
+            
+            words_per_sentence = words / sentences if sentences else 0.0
+            syllables_per_word = syllables / words if words else 0.0
+            chars_per_word = char_count(text, ignore_spaces=True) / raw_words if raw_words else 0.0
+            letters_per_100_words = letter_count(text) / words * 100 if words else 0.0
+            sentences_per_100_words = sentences / words * 100 if words else 0.0
+            has_flesch_counts = words_per_sentence != 0 and syllables_per_word != 0
+            
             return {
-                "flesch_reading_ease": flesch_reading_ease(text),
-                "flesch_kincaid_grade": flesch_kincaid_grade(text),
-                "automated_readability_index": automated_readability_index(text),
-                "coleman_liau_index": coleman_liau_index(text),
+                "flesch_reading_ease": (
+                    206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+                    if has_flesch_counts else 0.0
+                ),
+                "flesch_kincaid_grade": (
+                    (0.39 * words_per_sentence) + (11.8 * syllables_per_word) - 15.59
+                    if has_flesch_counts else 0.0
+                ),
+                "automated_readability_index": (
+                    (4.71 * chars_per_word) + (0.5 * words_per_sentence) - 21.43
+                    if chars_per_word != 0 and words_per_sentence != 0 else 0.0
+                ),
+                "coleman_liau_index": (
+                    (0.058 * letters_per_100_words) - (0.296 * sentences_per_100_words) - 15.8
+                    if letters_per_100_words != 0 and sentences_per_100_words != 0 else 0.0
+                ),
                 "gunning_fog": gunning_fog(text),
-                "smog_index": smog_index(text),
+                "smog_index": (
+                    (1.043 * (30 * (polysyllabcount(text) / sentences)) ** 0.5) + 3.1291
+                    if sentences else 0.0
+                ),
                 "linsear_write": linsear_write_formula(text)
             }
         except:
             return {"error": "Could not calculate readability scores"}
     
-    def _extract_cognitive_indicators(self, text: str, doc) -> Dict[str, Any]:
+    def _extract_cognitive_indicators(self, text: str, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract features indicative of cognitive health"""
-        words = [token for token in doc if token.is_alpha]
+        word_count = ctx.word_count
         
         # Hesitation markers
-        hesitation_markers = ['um', 'uh', 'er', 'ah', 'hmm', 'well', 'you know', 'like']
-        hesitation_count = sum(1 for token in doc if token.text.lower() in hesitation_markers)
+        hesitation_count = int(np.count_nonzero(np.isin(ctx.lower, HESITATION_MARKER_IDS)))
         
         # Repetition detection
-        word_sequence = [token.lemma_.lower() for token in words]
-        repetitions = self._detect_repetitions(word_sequence)
+        repetitions = self._detect_repetitions(ctx.lemma_lower[ctx.is_alpha])
         
         # Semantic fluency indicators
-        semantic_categories = self._categorize_semantic_content(doc)
+        semantic_categories = self._categorize_semantic_content(ctx)
         
         return {
             "hesitation_markers": hesitation_count,
-            "hesitation_ratio": hesitation_count / len(words) if words else 0,
+            "hesitation_ratio": hesitation_count / word_count if word_count else 0,
             "word_repetitions": repetitions,
             "semantic_fluency": semantic_categories,
-            "information_density": self._calculate_information_density(doc),
-            "cognitive_load_indicators": self._assess_cognitive_load(doc)
+            "information_density": self._calculate_information_density(ctx),
+            "cognitive_load_indicators": self._assess_cognitive_load(doc, ctx)
         }
     
-    def _extract_speech_patterns(self, text: str, doc, metadata: Dict = None) -> Dict[str, Any]:
+    def _extract_speech_patterns(self, text: str, doc, ctx: DocContext, metadata: Dict = None) -> Dict[str, Any]:
         """Extract speech-specific patterns and timing features"""
         features = {}
         
         if metadata and 'duration' in metadata:
             duration = metadata['duration']
-            word_count = len([token for token in doc if token.is_alpha])
+            word_count = ctx.word_count
             
             features.update({
                 "speech_rate": word_count / duration if duration > 0 else 0,
                 "words_per_minute": (word_count / duration) * 60 if duration > 0 else 0,
                 "pause_indicators": self._detect_pause_indicators(text),
-                "articulation_complexity": self._assess_articulation_complexity(doc)
+                "articulation_complexity": self._assess_articulation_complexity(ctx, doc.vocab.strings)
             })
         
         return features
     
     def _extract_sentiment_features(self, text: str) -> Dict[str, Any]:
         """Extract sentiment and emotional features"""
-        scores = self.sia.polarity_scores(text)
+        if len(text) < SHORT_TEXT_CHARS:
+            scores = self._short_text_scores(text)
+        else:
+            scores = self._polarity_scores(text)
         
         return {
             "sentiment_compound": scores['compound'],
@@ -282,168 +667,149 @@ class NLPFeatureExtractor:
             "emotional_valence": self._classify_emotional_valence(scores['compound'])
         }
     
-    def _extract_named_entities(self, doc) -> Dict[str, Any]:
+    def _polarity_scores(self, text: str) -> Dict[str, float]:
+        """VADER polarity scores for text"""
+        return self.sia.polarity_scores(text)
+    
+    def _extract_named_entities(self, doc, ctx: DocContext, detail_level: str = "counts") -> Dict[str, Any]:
         """Extract and categorize named entities"""
-        entities = []
-        for ent in doc.ents:
-            entities.append({
-                "text": ent.text,
-                "label": ent.label_,
-                "start": ent.start_char,
-                "end": ent.end_char
-            })
+        limit = None if detail_level == "full" else ENTITY_PREVIEW_LIMIT
         
-        entity_types = Counter([ent.label_ for ent in doc.ents])
+        return {
+            "entities": self._extract_named_entity_spans(doc, limit=limit),
+            **self._extract_named_entity_counts(ctx)
+        }
+    
+    def _extract_named_entity_counts(self, ctx: DocContext) -> Dict[str, Any]:
+        """Aggregate named entity counts by type"""
+        entity_types = ctx.entity_freq
         
         return {
-            "entities": entities,
             "entity_type_counts": dict(entity_types),
             "person_mentions": entity_types.get('PERSON', 0),
             "location_mentions": entity_types.get('GPE', 0) + entity_types.get('LOC', 0),
             "organization_mentions": entity_types.get('ORG', 0)
         }
     
-    def _extract_temporal_features(self, doc) -> Dict[str, Any]:
+    def _extract_named_entity_spans(self, doc, *, limit: int = None) -> List[Dict[str, Any]]:
+        """List named entity spans; with a limit, only the first entities ordered by label"""
+        ents = doc.ents if limit is None else heapq.nsmallest(limit, doc.ents, key=lambda ent: ent.label_)
+        
+        return [
+            {"text": ent.text, "label": ent.label_, "start": ent.start_char, "end": ent.end_char}
+            for ent in ents
+        ]
+    
+    def _extract_temporal_features(self, doc, ctx: DocContext, detail_level: str = "counts") -> Dict[str, Any]:
         """Extract temporal expressions and time-related features"""
-        temporal_entities = [ent for ent in doc.ents if ent.label_ in ['DATE', 'TIME', 'EVENT']]
+        temporal_count = sum(ctx.entity_freq.get(label, 0) for label in TEMPORAL_LABELS)
+        listed = (ent for ent in doc.ents if ent.label_ in TEMPORAL_LABELS)
+        if detail_level != "full":
+            listed = islice(listed, ENTITY_PREVIEW_LIMIT)
         
         return {
-            "temporal_expressions": len(temporal_entities),
-            "temporal_density": len(temporal_entities) / len(list(doc.sents)) if doc.sents else 0,
-            "temporal_entities": [{"text": ent.text, "label": ent.label_} for ent in temporal_entities]
+            "temporal_expressions": temporal_count,
+            "temporal_density": temporal_count / ctx.n_sents if ctx.n_sents else 0,
+            "temporal_entities": [{"text": ent.text, "label": ent.label_} for ent in listed]
         }
     
-    def _extract_complexity_metrics(self, text: str, doc) -> Dict[str, Any]:
+    def _extract_complexity_metrics(self, text: str, doc, ctx: DocContext) -> Dict[str, Any]:
         """Extract various complexity metrics"""
-        sentences = list(doc.sents)
-        words = [token for token in doc if token.is_alpha]
+        word_count = ctx.word_count
         
         # Syntactic complexity
-        embedded_clauses = sum(1 for token in doc if token.dep_ in ['ccomp', 'xcomp', 'advcl'])
+        embedded_clauses = _label_count(ctx.dep_counts, EMBEDDED_CLAUSE_DEP_IDS)
         
         # Lexical complexity
-        complex_words = sum(1 for token in words if len(token.text) > 6)
+        complex_words = ctx.long_word_count
         
         return {
-            "syntactic_complexity": embedded_clauses / len(sentences) if sentences else 0,
-            "lexical_complexity": complex_words / len(words) if words else 0,
-            "overall_complexity_score": self._calculate_overall_complexity(doc),
-            "cognitive_demand_score": self._calculate_cognitive_demand(doc)
+            "syntactic_complexity": embedded_clauses / ctx.n_sents if ctx.n_sents else 0,
+            "lexical_complexity": complex_words / word_count if word_count else 0,
+            "overall_complexity_score": self._calculate_overall_complexity(doc, ctx),
+            "cognitive_demand_score": self._calculate_cognitive_demand(doc, ctx)
         }
     
     # Helper methods
-    def _calculate_tree_depth(self, token, depth=0):
-        """Calculate the maximum depth of dependency tree"""
-        if not list(token.children):
-            return depth
-        return max(self._calculate_tree_depth(child, depth + 1) for child in token.children)
-    
-    def _calculate_passive_ratio(self, doc):
+    def _calculate_passive_ratio(self, ctx: DocContext):
         """Calculate ratio of passive voice constructions"""
-        passive_count = 0
-        total_verbs = 0
-        
-        for token in doc:
-            if token.pos_ == 'VERB':
-                total_verbs += 1
-                if token.dep_ == 'auxpass' or (token.dep_ == 'nsubjpass'):
-                    passive_count += 1
+        verb_mask = ctx.pos == VERB_ID
+        total_verbs = int(np.count_nonzero(verb_mask))
+        passive_count = int(np.count_nonzero(verb_mask & np.isin(ctx.dep, PASSIVE_DEP_IDS)))
         
         return passive_count / total_verbs if total_verbs > 0 else 0
     
-    def _extract_semantic_roles(self, doc):
+    def _extract_semantic_roles(self, ctx: DocContext):
         """Extract basic semantic role information"""
-        roles = {'agent': 0, 'patient': 0, 'theme': 0}
-        
-        for token in doc:
-            if token.dep_ == 'nsubj':
-                roles['agent'] += 1
-            elif token.dep_ == 'dobj':
-                roles['patient'] += 1
-            elif token.dep_ == 'pobj':
-                roles['theme'] += 1
-        
-        return roles
+        return {
+            'agent': _label_count(ctx.dep_counts, NSUBJ_ID),
+            'patient': _label_count(ctx.dep_counts, DOBJ_ID),
+            'theme': _label_count(ctx.dep_counts, POBJ_ID)
+        }
     
-    def _calculate_sentence_connectivity(self, sentences):
+    def _calculate_sentence_connectivity(self, ctx: DocContext):
         """Calculate how well sentences are connected"""
-        if len(sentences) < 2:
+        if ctx.n_sents < 2:
             return 0
         
         # Simple measure based on pronoun and determiner usage
-        connectivity_score = 0
-        for i in range(1, len(sentences)):
-            sent = sentences[i]
-            pronouns = sum(1 for token in sent if token.pos_ == 'PRON')
-            determiners = sum(1 for token in sent if token.pos_ == 'DET')
-            connectivity_score += (pronouns + determiners) / len(sent)
+        if NUMBA_AVAILABLE:
+            return float(_connectivity_kernel(ctx.pos, ctx.sent_starts, ctx.sent_ends, PRON_ID, DET_ID))
+        
+        linking = np.concatenate(([0], np.cumsum((ctx.pos == PRON_ID) | (ctx.pos == DET_ID))))
+        ratios = (linking[ctx.sent_ends] - linking[ctx.sent_starts]) / (ctx.sent_ends - ctx.sent_starts)
         
-        return connectivity_score / (len(sentences) - 1)
+        return float(ratios[1:].sum() / (ctx.n_sents - 1))
     
-    def _detect_repetitions(self, word_sequence):
+    def _detect_repetitions(self, word_ids: np.ndarray):
         """Detect word and phrase repetitions"""
-        repetitions = {'immediate': 0, 'near': 0}
+        if NUMBA_AVAILABLE:
+            immediate, near = _repetition_kernel(word_ids)
+            return {'immediate': int(immediate), 'near': int(near)}
         
-        for i in range(len(word_sequence) - 1):
-            if word_sequence[i] == word_sequence[i + 1]:
-                repetitions['immediate'] += 1
-            
-            # Check for repetitions within 3 words
-            for j in range(i + 2, min(i + 4, len(word_sequence))):
-                if word_sequence[i] == word_sequence[j]:
-                    repetitions['near'] += 1
-        
-        return repetitions
+        # Compare the sequence against itself shifted by 1 (immediate) and 2-3 (within 3 words)
+        return {
+            'immediate': int(np.count_nonzero(word_ids[:-1] == word_ids[1:])),
+            'near': int(np.count_nonzero(word_ids[:-2] == word_ids[2:]) + np.count_nonzero(word_ids[:-3] == word_ids[3:]))
+        }
     
-    def _categorize_semantic_content(self, doc):
+    def _categorize_semantic_content(self, ctx: DocContext):
         """Categorize content into semantic categories"""
-        categories = defaultdict(int)
-        
-        for token in doc:
-            if token.pos_ == 'NOUN':
-                # Simple categorization based on word
-                if token.lemma_ in ['person', 'people', 'man', 'woman', 'child']:
-                    categories['people'] += 1
-                elif token.lemma_ in ['house', 'home', 'building', 'room']:
-                    categories['places'] += 1
-                elif token.lemma_ in ['car', 'bike', 'plane', 'train']:
-                    categories['transportation'] += 1
-                else:
-                    categories['other'] += 1
-        
-        return dict(categories)
-    
-    def _calculate_information_density(self, doc):
+        noun_lemmas = ctx.lemma[ctx.pos == NOUN_ID]
+        
+        # Simple categorization based on word
+        categories = np.select(
+            [
+                np.isin(noun_lemmas, PEOPLE_WORD_IDS),
+                np.isin(noun_lemmas, PLACE_WORD_IDS),
+                np.isin(noun_lemmas, TRANSPORT_WORD_IDS)
+            ],
+            ['people', 'places', 'transportation'],
+            'other'
+        )
+        
+        return _first_seen_counts(categories)
+    
+    def _calculate_information_density(self, ctx: DocContext):
         """Calculate information density of the text"""
-        content_words = sum(1 for token in doc if token.pos_ in ['NOUN', 'VERB', 'ADJ', 'ADV'])
-        total_words = sum(1 for token in doc if token.is_alpha)
+        content_words = int(np.count_nonzero(np.isin(ctx.pos, CONTENT_POS_IDS)))
+        total_words = ctx.word_count
         
         return content_words / total_words if total_words > 0 else 0
     
-    def _assess_cognitive_load(self, doc):
+    def _assess_cognitive_load(self, doc, ctx: DocContext):
         """Assess indicators of cognitive load"""
-        indicators = {
-            'complex_sentences': 0,
-            'nested_structures': 0,
-            'abstract_concepts': 0
-        }
+        # Complex sentences (multiple clauses)
+        clause_counts = _sentence_sums(np.isin(ctx.dep, EMBEDDED_CLAUSE_DEP_IDS), ctx.sent_starts)
         
-        for sent in doc.sents:
-            # Complex sentences (multiple clauses)
-            clause_count = sum(1 for token in sent if token.dep_ in ['ccomp', 'xcomp', 'advcl'])
-            if clause_count > 1:
-                indicators['complex_sentences'] += 1
-            
-            # Nested structures
-            max_depth = self._calculate_tree_depth(sent.root)
-            if max_depth > 3:
-                indicators['nested_structures'] += 1
-            
-            # Abstract concepts (simplified)
-            abstract_words = sum(1 for token in sent if token.pos_ == 'NOUN' and len(token.text) > 8)
-            indicators['abstract_concepts'] += abstract_words
+        # Abstract concepts (simplified); all tokens belong to some sentence
+        abstract_words = np.count_nonzero((ctx.pos == NOUN_ID) & (ctx.length > 8))
         
-        return indicators
+        return {
+            'complex_sentences': int(np.count_nonzero(clause_counts > 1)),
+            'nested_structures': int(np.count_nonzero(ctx.sent_tree_depths > 3)),
+            'abstract_concepts': int(abstract_words)
+        }
     
     def _detect_pause_indicators(self, text):
         """Detect indicators of pauses in speech"""
@@ -457,17 +823,16 @@ class NLPFeatureExtractor:
             'dash_count': text.count('--')
         }
     
-    def _assess_articulation_complexity(self, doc):
+    def _assess_articulation_complexity(self, ctx: DocContext, strings):
         """Assess complexity of articulation based on phonological features"""
-        complex_sounds = 0
-        total_words = 0
+        total_words = ctx.word_count
         
-        for token in doc:
-            if token.is_alpha:
-                total_words += 1
-                # Simple heuristic for articulation complexity
-                if any(cluster in token.text.lower() for cluster in ['str', 'spr', 'thr', 'scr']):
-                    complex_sounds += 1
+        # Simple heuristic for articulation complexity, checked once per distinct word
+        word_ids, counts = np.unique(ctx.lower[ctx.is_alpha], return_counts=True)
+        complex_sounds = sum(
+            count for word_id, count in zip(word_ids.tolist(), counts.tolist())
+            if ARTICULATION_RE.search(strings[word_id])
+        )
         
         return complex_sounds / total_words if total_words > 0 else 0
     
@@ -480,68 +845,119 @@ class NLPFeatureExtractor:
         else:
             return 'neutral'
     
-    def _calculate_overall_complexity(self, doc):
+    def _calculate_overall_complexity(self, doc, ctx: DocContext):
         """Calculate overall text complexity score"""
         # Combine multiple complexity measures
-        syntactic = len([token for token in doc if token.dep_ in ['ccomp', 'xcomp', 'advcl']])
-        lexical = len([token for token in doc if token.is_alpha and len(token.text) > 6])
-        semantic = len(doc.ents)
+        syntactic = _label_count(ctx.dep_counts, EMBEDDED_CLAUSE_DEP_IDS)
+        lexical = ctx.long_word_count
+        semantic = ctx.entity_count
         
-        total_tokens = len([token for token in doc if token.is_alpha])
+        total_tokens = ctx.word_count
         
         if total_tokens == 0:
             return 0
         
         return (syntactic + lexical + semantic) / total_tokens
     
-    def _calculate_cognitive_demand(self, doc):
+    def _calculate_cognitive_demand(self, doc, ctx: DocContext):
         """Calculate cognitive demand score"""
         # Simplified cognitive demand calculation
-        complex_structures = sum(1 for token in doc if token.dep_ in ['ccomp', 'xcomp', 'advcl', 'relcl'])
-        abstract_words = sum(1 for token in doc if token.pos_ == 'NOUN' and len(token.text) > 7)
+        complex_structures = _label_count(ctx.dep_counts, DEMANDING_CLAUSE_DEP_IDS)
+        abstract_words = int(np.count_nonzero((ctx.pos == NOUN_ID) & (ctx.length > 7)))
         
-        total_sentences = len(list(doc.sents))
+        total_sentences = ctx.n_sents
         
         return (complex_structures + abstract_words) / total_sentences if total_sentences > 0 else 0
     
-    def _get_word_length_distribution(self, doc):
+    def _get_word_length_distribution(self, ctx: DocContext):
         """Get distribution of word lengths"""
-        lengths = [len(token.text) for token in doc if token.is_alpha]
-        length_counts = Counter(lengths)
+        total = ctx.word_count
         
         return {
-            'mean_length': sum(lengths) / len(lengths) if lengths else 0,
-            'distribution': dict(length_counts),
-            'long_words_ratio': sum(1 for length in lengths if length > 6) / len(lengths) if lengths else 0
+            'mean_length': ctx.alpha_length_total / total if total else 0,
+            'distribution': dict(ctx.length_freq),
+            'long_words_ratio': ctx.long_word_count / total if total else 0
         }
 
+def serve(lines):
+    """Persistent worker mode: answer one JSON request per line with one JSON result per line
+    
+    Extractors are kept alive across requests, one per spaCy model and mode. A
+    request with a "batch" list of requests is parsed together with nlp.pipe and
+    answered with a list of results. Batches are parsed in this process unless
+    they reach MULTIPROCESS_MIN_BATCH texts or the request sets "n_process".
+    """
+    extractors = {}
+    
+    for line in lines:
+        if not line.strip():
+            continue
+        
+        try:
+            request = _loads(line)
+            spacy_model = request.get('spacy_model', 'en_core_web_sm')
+            fast = request.get('fast', False)
+            detail_level = request.get('detail_level', 'counts')
+            
+            extractor = extractors.get((spacy_model, fast))
+            if extractor is None:
+                extractor = extractors[(spacy_model, fast)] = NLPFeatureExtractor(spacy_model, fast=fast)
+            
+            if 'batch' in request:
+                batch = request['batch']
+                # A process pool is started per request, so small batches stay in this process
+                n_process = request.get('n_process')
+                if n_process is None:
+                    n_process = max(1, (os.cpu_count() or 1) // 2) if len(batch) >= MULTIPROCESS_MIN_BATCH else 1
+                
+                result = list(extractor.extract_features_batch(
+                    [item.get('text', '') for item in batch],
+                    [item.get('metadata', {}) for item in batch],
+                    detail_level,
+                    n_process=n_process
+                ))
+            else:
+                result = extractor.extract_features(request.get('text', ''), request.get('metadata', {}), detail_level)
+        
+        except json.JSONDecodeError:
+            result = {"error": "Invalid JSON input"}
+        except Exception as e:
+            result = {"error": f"Processing failed: {str(e)}"}
+        
+        print(_dumps(result), flush=True)
+
 def main():
-    """Main function to process command line arguments and extract features"""
+    """Main function to process command line arguments and extract features
+    
+    With no argument, runs as a persistent worker reading JSON-lines requests from stdin
+    """
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "No text provided"}))
-        sys.exit(1)
+        serve(sys.stdin)
+        return
     
     try:
         # Parse input arguments
-        input_data = json.loads(sys.argv[1])
+        input_data = _loads(sys.argv[1])
         text = input_data.get('text', '')
         metadata = input_data.get('metadata', {})
         spacy_model = input_data.get('spacy_model', 'en_core_web_sm')
+        fast = input_data.get('fast', False)
+        detail_level = input_data.get('detail_level', 'counts')
         
         # Initialize extractor
-        extractor = NLPFeatureExtractor(spacy_model)
+        extractor = NLPFeatureExtractor(spacy_model, fast=fast)
         
         # Extract features
-        features = extractor.extract_features(text, metadata)
+        features = extractor.extract_features(text, metadata, detail_level)
         
         # Output results
-        print(json.dumps(features, indent=2))
+        print(_dumps(features, indent=True))
         
     except json.JSONDecodeError:
-        print(json.dumps({"error": "Invalid JSON input"}))
+        print(_dumps({"error": "Invalid JSON input"}))
         sys.exit(1)
     except Exception as e:
-        print(json.dumps({"error": f"Processing failed: {str(e)}"}))
+        print(_dumps({"error": f"Processing failed: {str(e)}"}))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -7,12 +7,14 @@ Generates SHAP values and visualizations for cognitive health predictions
 import json
 import sys
 import os
+import time
+import itertools
+import atexit
 import numpy as np
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+import importlib.util
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Tuple, Any, Optional
 
@@ -25,12 +27,90 @@ try:
 except ImportError:
     SHAP_AVAILABLE = False
 
+# Package versions are fixed for the life of the process
+_SHAP_VERSION = shap.__version__ if SHAP_AVAILABLE else None
+_MPL_VERSION = None
+
+# seaborn imports pyplot, so it is only located here and loaded with it
+SEABORN_AVAILABLE = importlib.util.find_spec('seaborn') is not None
+
+# pyplot is imported on first use so JSON-only runs skip its startup cost
+_plt = None
+
+# PNG encoding runs in the background, shared by every explainer in the process
+_SAVER = ThreadPoolExecutor(max_workers=2)
+atexit.register(_SAVER.shutdown)
+
+def _lazy_import_pyplot():
+    """
+    Import matplotlib.pyplot with the non-interactive backend on first use
+    """
+    global _plt, _MPL_VERSION, SEABORN_AVAILABLE
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Use non-interactive backend
+        import matplotlib.pyplot as pyplot
+        
+        if SEABORN_AVAILABLE:
+            # find_spec only proves seaborn is installed, not that it imports
+            try:
+                import seaborn as sns
+                sns.set_style("whitegrid")
+            except ImportError:
+                SEABORN_AVAILABLE = False
+        
+        _MPL_VERSION = matplotlib.__version__
+        _plt = pyplot
+    
+    return _plt
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        return lambda func: func
+
 try:
-    import seaborn as sns
-    sns.set_style("whitegrid")
-    SEABORN_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SEABORN_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+@njit(cache=True, fastmath=True)
+def _tree_shap_kernel(values, weights, noise, total_contribution):
+    """
+    Simulated TreeSHAP kernel: weighted deviations from the 0.5 baseline
+    plus noise, scaled in one step so they sum to the total contribution
+    """
+    contributions = np.empty(values.shape[0])
+    current_sum = 0.0
+    for i in range(values.shape[0]):
+        contributions[i] = (values[i] - 0.5) * weights[i] + noise[i]
+        current_sum += contributions[i]
+    
+    factor = total_contribution / current_sum if abs(current_sum) > 1e-12 else 0.0
+    for i in range(values.shape[0]):
+        contributions[i] *= factor
+    
+    return contributions
+
+if NUMBA_AVAILABLE:
+    # Compile on import so the first explanation doesn't pay JIT latency
+    _tree_shap_kernel(np.zeros(1), np.zeros(1), np.zeros(1), 0.0)
 
 class CognitiveShapExplainer:
     """
@@ -82,6 +162,59 @@ class CognitiveShapExplainer:
             'sentimentScore': (-2.0, 2.0)
         }
         
+        self._feature_name_array = np.array(self.feature_names)
+        
+        # Normalization bounds aligned with feature_names
+        self._mins = np.array([self.feature_ranges[name][0] for name in self.feature_names], dtype=np.float64)
+        self._ranges = np.array([self.feature_ranges[name][1] - self.feature_ranges[name][0] for name in self.feature_names], dtype=np.float64)
+        
+        # Feature weights aligned with feature_names (0.01 when unlisted)
+        self._weights = np.array([self.feature_weights.get(name, 0.01) for name in self.feature_names], dtype=np.float64)
+        self._abs_weight_sum = float(np.abs(self._weights).sum())
+        
+        # Random generator for simulated noise
+        self._rng = np.random.default_rng()
+        
+        # Figures reused across plots, keyed by (viz_type, figsize)
+        self._fig_cache = {}
+        self._summary_cbar = None
+        
+        # Background saves by figure; a figure is reused only after its pending save finishes
+        self._pending_saves = {}
+        
+        # Plot builders by visualization type
+        self._viz_dispatch = {
+            'waterfall': self._create_waterfall_plot,
+            'bar': self._create_bar_plot,
+            'force': self._create_force_plot,
+            'summary': self._create_summary_plot,
+            'dependence': self._create_dependence_plot
+        }
+        
+        # check_health result, built on first call
+        self._health_cache = None
+        
+        # Sequence number keeping visualization filenames unique within a process
+        self._file_counter = itertools.count()
+        
+        # Fields shared by every explanation; per-call values are filled in on a copy
+        self._result_template = {
+            'shapValues': None,
+            'baseValue': self.expected_value,
+            'expectedValue': self.expected_value,
+            'featureNames': self.feature_names,
+            'featureValues': None,
+            'modelType': 'ensemble',
+            'processingTime': 0.0,
+            'visualizations': None,
+            'metadata': None
+        }
+        self._metadata_template = {
+            'shapVersion': _SHAP_VERSION or 'unavailable',
+            'timestamp': None,
+            'featureCount': len(self.feature_names)
+        }
+        
     def generate_shap_explanation(self, features: Dict[str, float], prediction: Dict[str, Any], options: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Generate SHAP explanation for a cognitive model prediction
@@ -94,78 +227,61 @@ class CognitiveShapExplainer:
         Returns:
             Dictionary containing SHAP values and metadata
         """
+        # Prepare feature vector, shared with the fallback explanation
+        feature_vector = self._prepare_feature_vector(features)
+        
         try:
             start_time = datetime.now()
             options = options or {}
             
-            # Prepare feature vector
-            feature_vector = self._prepare_feature_vector(features)
-            
             # Generate SHAP values
-            shap_values = self._calculate_shap_values(feature_vector, prediction)
+            shap_array = self._calculate_shap_values(feature_vector, prediction)
             
             # Create visualizations if requested
             visualizations = {}
             if options.get('explanationTypes'):
                 visualizations = self._generate_visualizations(
-                    shap_values, feature_vector, options
+                    (self._feature_name_array, shap_array), feature_vector, options
                 )
             
+            shap_values = self._as_feature_dict(shap_array)
+            feature_values = self._as_feature_dict(feature_vector)
+            
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds()
             
-            result = {
-                'shapValues': shap_values,
-                'baseValue': self.expected_value,
-                'expectedValue': self.expected_value,
-                'featureNames': list(shap_values.keys()),
-                'featureValues': feature_vector,
-                'modelType': 'ensemble',
-                'processingTime': processing_time,
-                'visualizations': visualizations,
-                'metadata': {
-                    'shapVersion': shap.__version__ if SHAP_AVAILABLE else 'unavailable',
-                    'timestamp': datetime.now().isoformat(),
-                    'featureCount': len(feature_vector)
-                }
-            }
+            metadata = self._metadata_template.copy()
+            metadata['timestamp'] = datetime.now().isoformat()
+            
+            result = self._result_template.copy()
+            result['shapValues'] = shap_values
+            result['featureValues'] = feature_values
+            result['processingTime'] = processing_time
+            result['visualizations'] = visualizations
+            result['metadata'] = metadata
             
             return result
             
         except Exception as e:
-            return self._fallback_explanation(features, prediction, str(e))
+            return self._fallback_explanation(feature_vector, prediction, str(e))
     
-    def _prepare_feature_vector(self, features: Dict[str, float]) -> Dict[str, float]:
+    def _prepare_feature_vector(self, features: Dict[str, float]) -> np.ndarray:
         """
-        Prepare and normalize feature vector
+        Prepare and normalize feature vector, aligned with feature_names
         """
-        vector = {}
+        raw = np.array([features.get(name) for name in self.feature_names], dtype=np.float64)
         
-        for feature_name in self.feature_names:
-            value = features.get(feature_name, None)
-            
-            if value is not None and not np.isnan(value):
-                # Normalize value to 0-1 range
-                normalized_value = self._normalize_feature(feature_name, value)
-                vector[feature_name] = normalized_value
-            else:
-                # Use median value for missing features
-                vector[feature_name] = 0.5
-        
-        return vector
+        # Normalize values to 0-1 range, using the median value for missing features
+        normalized = np.clip((raw - self._mins) / self._ranges, 0.0, 1.0)
+        return np.where(np.isnan(normalized), 0.5, normalized)
     
-    def _normalize_feature(self, feature_name: str, value: float) -> float:
+    def _as_feature_dict(self, values: np.ndarray) -> Dict[str, float]:
         """
-        Normalize feature value to 0-1 range
+        Map an array aligned with feature_names back to a feature dictionary
         """
-        if feature_name not in self.feature_ranges:
-            return max(0.0, min(1.0, value))
-        
-        min_val, max_val = self.feature_ranges[feature_name]
-        normalized = (value - min_val) / (max_val - min_val)
-        return max(0.0, min(1.0, normalized))
+        return dict(zip(self.feature_names, values.tolist()))
     
-    def _calculate_shap_values(self, feature_vector: Dict[str, float], prediction: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_shap_values(self, feature_vector: np.ndarray, prediction: Dict[str, Any]) -> np.ndarray:
         """
         Calculate SHAP values for features
         """
@@ -179,93 +295,54 @@ class CognitiveShapExplainer:
             # Fallback to linear approximation
             return self._calculate_approximate_shap(feature_vector, prediction)
     
-    def _calculate_tree_shap(self, feature_vector: Dict[str, float], prediction: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_tree_shap(self, feature_vector: np.ndarray, prediction: Dict[str, Any]) -> np.ndarray:
         """
         Calculate SHAP values using TreeExplainer (simulated)
         """
-        shap_values = {}
         risk_score = prediction.get('riskScore', 0.5)
         
         # Simulate TreeSHAP values based on feature importance and prediction
         total_contribution = risk_score - self.expected_value
         
-        # Calculate individual contributions
-        weighted_sum = 0
-        for feature_name, value in feature_vector.items():
-            weight = self.feature_weights.get(feature_name, 0.01)
-            weighted_sum += abs(weight)
-        
-        for feature_name, value in feature_vector.items():
-            weight = self.feature_weights.get(feature_name, 0.01)
-            
-            # Calculate base contribution
-            base_contribution = (value - 0.5) * weight
-            
-            # Scale to match total contribution
-            if weighted_sum > 0:
-                scaled_contribution = base_contribution * (total_contribution / weighted_sum)
-            else:
-                scaled_contribution = 0
-            
-            # Add some realistic noise
-            noise = np.random.normal(0, 0.01)
-            shap_values[feature_name] = scaled_contribution + noise
+        # Scale contributions with some realistic noise, summing to (prediction - expected_value)
+        noise = self._rng.standard_normal(len(feature_vector)) * 0.01
+        contributions = _tree_shap_kernel(
+            feature_vector, self._weights, noise, float(total_contribution)
+        )
         
-        # Ensure SHAP values sum to (prediction - expected_value)
-        current_sum = sum(shap_values.values())
-        if current_sum != 0:
-            adjustment_factor = total_contribution / current_sum
-            shap_values = {k: v * adjustment_factor for k, v in shap_values.items()}
-        
-        return shap_values
+        return contributions
     
-    def _calculate_approximate_shap(self, feature_vector: Dict[str, float], prediction: Dict[str, Any]) -> Dict[str, float]:
+    def _calculate_approximate_shap(self, feature_vector: np.ndarray, prediction: Dict[str, Any]) -> np.ndarray:
         """
         Calculate approximate SHAP values using linear approximation
         """
-        shap_values = {}
         risk_score = prediction.get('riskScore', 0.5)
         total_contribution = risk_score - self.expected_value
         
-        # Calculate contributions based on feature weights
-        total_weight = sum(abs(self.feature_weights.get(name, 0.01)) for name in feature_vector.keys())
-        
-        for feature_name, value in feature_vector.items():
-            weight = self.feature_weights.get(feature_name, 0.01)
-            
-            # Feature contribution proportional to deviation from baseline and weight
-            deviation = value - 0.5  # Baseline is 0.5
-            contribution = deviation * weight * (total_contribution / total_weight) if total_weight > 0 else 0
-            
-            shap_values[feature_name] = contribution
-        
-        return shap_values
+        # Feature contribution proportional to deviation from baseline (0.5) and weight
+        scale = total_contribution / self._abs_weight_sum if self._abs_weight_sum > 0 else 0.0
+        return (feature_vector - 0.5) * self._weights * scale
     
-    def _generate_visualizations(self, shap_values: Dict[str, float], feature_vector: Dict[str, float], options: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_visualizations(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate SHAP visualizations
         """
         visualizations = {}
         explanation_types = options.get('explanationTypes', ['waterfall', 'bar'])
         output_path = options.get('outputPath', './visualizations')
+        dpi = options.get('dpi', 100)
         
         # Ensure output directory exists
         os.makedirs(output_path, exist_ok=True)
         
+        saves = {}
         for viz_type in explanation_types:
+            create_plot = self._viz_dispatch.get(viz_type)
+            if create_plot is None:
+                continue
+            
             try:
-                if viz_type == 'waterfall':
-                    viz_file = self._create_waterfall_plot(shap_values, feature_vector, output_path)
-                elif viz_type == 'bar':
-                    viz_file = self._create_bar_plot(shap_values, output_path)
-                elif viz_type == 'force':
-                    viz_file = self._create_force_plot(shap_values, feature_vector, output_path)
-                elif viz_type == 'summary':
-                    viz_file = self._create_summary_plot(shap_values, feature_vector, output_path)
-                elif viz_type == 'dependence':
-                    viz_file = self._create_dependence_plot(shap_values, feature_vector, output_path)
-                else:
-                    continue
+                viz_file, saves[viz_type] = create_plot(shap_values, feature_vector, output_path, dpi)
                 
                 visualizations[viz_type] = {
                     'filename': viz_file,
@@ -280,36 +357,96 @@ class CognitiveShapExplainer:
                     'type': viz_type
                 }
         
+        # A plot only counts as generated once its file has been written
+        wait(list(saves.values()))
+        for viz_type, save in saves.items():
+            error = save.exception()
+            if error is not None:
+                visualizations[viz_type] = {
+                    'status': 'failed',
+                    'error': str(error),
+                    'type': viz_type
+                }
+        
         return visualizations
     
-    def _create_waterfall_plot(self, shap_values: Dict[str, float], feature_vector: Dict[str, float], output_path: str) -> str:
+    def _get_or_create_fig(self, viz_type: str, figsize: Tuple[int, int], ncols: int = 1) -> Tuple[Any, Any]:
+        """
+        Get the cached figure for a visualization type, clearing its axes for reuse
+        """
+        key = (viz_type, figsize)
+        cached = self._fig_cache.get(key)
+        
+        if cached is None:
+            cached = _lazy_import_pyplot().subplots(1, ncols, figsize=figsize)
+            self._fig_cache[key] = cached
+        else:
+            pending = self._pending_saves.pop(cached[0], None)
+            if pending is not None:
+                wait([pending])
+            for ax in np.atleast_1d(cached[1]):
+                ax.clear()
+        
+        return cached
+    
+    def _save_figure(self, fig: Any, filepath: str, dpi: int) -> Future:
+        """
+        Queue a figure to be written to filepath on the background saver
+        """
+        future = _SAVER.submit(fig.savefig, filepath, dpi=dpi, bbox_inches='tight')
+        self._pending_saves[fig] = future
+        return future
+    
+    def _make_filename(self, viz_type: str) -> str:
+        """
+        Build a unique PNG filename for a visualization
+        """
+        return f'{viz_type}_{time.time_ns()}_{next(self._file_counter)}.png'
+    
+    def close(self):
+        """
+        Wait for pending saves and close cached visualization figures
+        """
+        wait(list(self._pending_saves.values()))
+        self._pending_saves.clear()
+        
+        for fig, _ in self._fig_cache.values():
+            _plt.close(fig)
+        self._fig_cache.clear()
+        self._summary_cbar = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _create_waterfall_plot(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, output_path: str, dpi: int = 100) -> Tuple[str, Future]:
         """
         Create waterfall plot showing feature contributions
         """
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = self._get_or_create_fig('waterfall', (12, 8))
         
         # Sort features by absolute SHAP value
-        sorted_features = sorted(shap_values.items(), key=lambda x: abs(x[1]), reverse=True)
+        names, shap_array = shap_values
+        order = np.argsort(-np.abs(shap_array), kind='stable')
         
         # Prepare data for waterfall plot
-        features = [item[0] for item in sorted_features]
-        values = [item[1] for item in sorted_features]
+        features = names[order]
+        values = shap_array[order]
         
-        # Create waterfall plot
-        cumulative = [self.expected_value]
-        colors = []
-        
-        for i, (feature, value) in enumerate(sorted_features):
-            cumulative.append(cumulative[-1] + value)
-            colors.append('#2E8B57' if value > 0 else '#DC143C')  # Green for positive, red for negative
+        # Running total from the baseline; bar i spans cumulative[i] to cumulative[i + 1]
+        cumulative = np.cumsum(np.concatenate(([self.expected_value], values)))
+        starts = cumulative[:-1]
+        bottoms = np.where(values > 0, starts, starts + values)
+        colors = np.where(values > 0, '#2E8B57', '#DC143C')  # Green for positive, red for negative
         
         # Plot bars
-        for i, (feature, value) in enumerate(sorted_features):
-            bottom = cumulative[i] if value > 0 else cumulative[i] + value
-            ax.bar(i, abs(value), bottom=bottom, color=colors[i], alpha=0.7, edgecolor='black', linewidth=0.5)
-            
-            # Add value labels
-            label_y = cumulative[i] + value/2
+        positions = np.arange(len(values))
+        ax.bar(positions, np.abs(values), bottom=bottoms, color=colors, alpha=0.7, edgecolor='black', linewidth=0.5)
+        
+        # Add value labels
+        for i, (label_y, value) in enumerate(zip(starts + values / 2, values)):
             ax.text(i, label_y, f'{value:.3f}', ha='center', va='center', fontweight='bold', fontsize=9)
         
         # Add baseline and final prediction lines
@@ -326,26 +463,24 @@ class CognitiveShapExplainer:
         ax.grid(True, alpha=0.3)
         
         # Save plot
-        filename = f'waterfall_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{np.random.randint(1000, 9999)}.png'
+        filename = self._make_filename('waterfall')
         filepath = os.path.join(output_path, filename)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        fig.tight_layout()
+        return filename, self._save_figure(fig, filepath, dpi)
     
-    def _create_bar_plot(self, shap_values: Dict[str, float], output_path: str) -> str:
+    def _create_bar_plot(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, output_path: str, dpi: int = 100) -> Tuple[str, Future]:
         """
         Create bar plot of feature importance
         """
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = self._get_or_create_fig('bar', (10, 8))
         
         # Sort features by absolute SHAP value
-        sorted_features = sorted(shap_values.items(), key=lambda x: abs(x[1]), reverse=True)
+        names, shap_array = shap_values
+        order = np.argsort(-np.abs(shap_array), kind='stable')
         
-        features = [item[0] for item in sorted_features]
-        values = [item[1] for item in sorted_features]
-        colors = ['#2E8B57' if v > 0 else '#DC143C' for v in values]
+        features = names[order]
+        values = shap_array[order]
+        colors = np.where(values > 0, '#2E8B57', '#DC143C')
         
         # Create horizontal bar plot
         bars = ax.barh(range(len(features)), values, color=colors, alpha=0.7, edgecolor='black', linewidth=0.5)
@@ -365,27 +500,27 @@ class CognitiveShapExplainer:
         ax.grid(True, alpha=0.3, axis='x')
         
         # Add legend
+        plt = _lazy_import_pyplot()
         positive_patch = plt.Rectangle((0, 0), 1, 1, facecolor='#2E8B57', alpha=0.7, label='Positive Impact')
         negative_patch = plt.Rectangle((0, 0), 1, 1, facecolor='#DC143C', alpha=0.7, label='Negative Impact')
         ax.legend(handles=[positive_patch, negative_patch])
         
         # Save plot
-        filename = f'bar_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{np.random.randint(1000, 9999)}.png'
+        filename = self._make_filename('bar')
         filepath = os.path.join(output_path, filename)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        fig.tight_layout()
+        return filename, self._save_figure(fig, filepath, dpi)
     
-    def _create_force_plot(self, shap_values: Dict[str, float], feature_vector: Dict[str, float], output_path: str) -> str:
+    def _create_force_plot(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, output_path: str, dpi: int = 100) -> Tuple[str, Future]:
         """
         Create force plot visualization (simplified version)
         """
-        fig, ax = plt.subplots(figsize=(14, 6))
+        fig, ax = self._get_or_create_fig('force', (14, 6))
         
         # Sort features by SHAP value
-        sorted_features = sorted(shap_values.items(), key=lambda x: x[1], reverse=True)
+        names, shap_array = shap_values
+        order = np.argsort(-shap_array, kind='stable')
+        sorted_features = zip(names[order], shap_array[order])
         
         # Create force plot visualization
         y_pos = 0.5
@@ -424,24 +559,23 @@ class CognitiveShapExplainer:
         ax.grid(True, alpha=0.3, axis='x')
         
         # Save plot
-        filename = f'force_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{np.random.randint(1000, 9999)}.png'
+        filename = self._make_filename('force')
         filepath = os.path.join(output_path, filename)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        fig.tight_layout()
+        return filename, self._save_figure(fig, filepath, dpi)
     
-    def _create_summary_plot(self, shap_values: Dict[str, float], feature_vector: Dict[str, float], output_path: str) -> str:
+    def _create_summary_plot(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, output_path: str, dpi: int = 100) -> Tuple[str, Future]:
         """
         Create summary plot of SHAP values
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        fig, (ax1, ax2) = self._get_or_create_fig('summary', (16, 8), ncols=2)
         
         # Left plot: Feature importance
-        sorted_features = sorted(shap_values.items(), key=lambda x: abs(x[1]), reverse=True)
-        features = [item[0] for item in sorted_features]
-        abs_values = [abs(item[1]) for item in sorted_features]
+        names, shap_array = shap_values
+        abs_array = np.abs(shap_array)
+        order = np.argsort(-abs_array, kind='stable')
+        features = names[order]
+        abs_values = abs_array[order]
         
         bars = ax1.barh(range(len(features)), abs_values, color='skyblue', alpha=0.7, edgecolor='black')
         ax1.set_xlabel('Mean |SHAP Value|', fontsize=12, fontweight='bold')
@@ -452,11 +586,11 @@ class CognitiveShapExplainer:
         ax1.grid(True, alpha=0.3, axis='x')
         
         # Right plot: SHAP values with feature values
-        values = [item[1] for item in sorted_features]
-        feature_vals = [feature_vector.get(item[0], 0.5) for item in sorted_features]
+        values = shap_array[order]
+        feature_vals = feature_vector[order]
         
         scatter = ax2.scatter(values, range(len(features)), c=feature_vals, cmap='RdYlBu', 
-                            s=100, alpha=0.7, edgecolors='black')
+                            s=100, alpha=0.7, edgecolors='black', rasterized=True)
         ax2.set_xlabel('SHAP Value', fontsize=12, fontweight='bold')
         ax2.set_ylabel('Features', fontsize=12, fontweight='bold')
         ax2.set_title('SHAP Values Colored by Feature Value', fontsize=14, fontweight='bold')
@@ -465,45 +599,40 @@ class CognitiveShapExplainer:
         ax2.axvline(x=0, color='black', linestyle='-', alpha=0.3)
         ax2.grid(True, alpha=0.3, axis='x')
         
-        # Add colorbar
-        cbar = plt.colorbar(scatter, ax=ax2)
-        cbar.set_label('Feature Value', fontsize=10, fontweight='bold')
+        # Add colorbar once; a cached figure keeps its colorbar axes and only retargets it
+        if self._summary_cbar is None:
+            self._summary_cbar = fig.colorbar(scatter, ax=ax2)
+            self._summary_cbar.set_label('Feature Value', fontsize=10, fontweight='bold')
+        else:
+            self._summary_cbar.update_normal(scatter)
         
         # Save plot
-        filename = f'summary_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{np.random.randint(1000, 9999)}.png'
+        filename = self._make_filename('summary')
         filepath = os.path.join(output_path, filename)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        fig.tight_layout()
+        return filename, self._save_figure(fig, filepath, dpi)
     
-    def _create_dependence_plot(self, shap_values: Dict[str, float], feature_vector: Dict[str, float], output_path: str) -> str:
+    def _create_dependence_plot(self, shap_values: Tuple[np.ndarray, np.ndarray], feature_vector: np.ndarray, output_path: str, dpi: int = 100) -> Tuple[str, Future]:
         """
         Create dependence plot for top feature
         """
         # Get top feature by absolute SHAP value
-        top_feature = max(shap_values.items(), key=lambda x: abs(x[1]))
-        feature_name, shap_val = top_feature
+        names, shap_array = shap_values
+        top_idx = int(np.argmax(np.abs(shap_array)))
+        feature_name, shap_val = self.feature_names[top_idx], float(shap_array[top_idx])
         
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = self._get_or_create_fig('dependence', (10, 6))
         
         # Simulate dependence data (in real implementation, this would use actual data)
         feature_range = np.linspace(0, 1, 50)
-        simulated_shap = []
-        
-        for val in feature_range:
-            # Simulate how SHAP value changes with feature value
-            weight = self.feature_weights.get(feature_name, 0.01)
-            base_shap = (val - 0.5) * weight
-            noise = np.random.normal(0, 0.01)
-            simulated_shap.append(base_shap + noise)
+        weight = self._weights[top_idx]
+        simulated_shap = (feature_range - 0.5) * weight + self._rng.standard_normal(len(feature_range)) * 0.01
         
         # Plot dependence
         ax.scatter(feature_range, simulated_shap, alpha=0.6, s=50, c='blue', edgecolors='black')
         
         # Highlight current prediction
-        current_val = feature_vector.get(feature_name, 0.5)
+        current_val = feature_vector[top_idx]
         ax.scatter([current_val], [shap_val], color='red', s=200, marker='*', 
                   edgecolors='black', linewidth=2, label='Current Prediction')
         
@@ -515,38 +644,25 @@ class CognitiveShapExplainer:
         ax.legend()
         
         # Save plot
-        filename = f'dependence_{datetime.now().strftime("%Y%m%d_%H%M%S")}_{np.random.randint(1000, 9999)}.png'
+        filename = self._make_filename('dependence')
         filepath = os.path.join(output_path, filename)
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return filename
+        fig.tight_layout()
+        return filename, self._save_figure(fig, filepath, dpi)
     
-    def _fallback_explanation(self, features: Dict[str, float], prediction: Dict[str, Any], error_msg: str) -> Dict[str, Any]:
+    def _fallback_explanation(self, feature_vector: np.ndarray, prediction: Dict[str, Any], error_msg: str) -> Dict[str, Any]:
         """
         Fallback explanation when SHAP generation fails
         """
         # Simple feature importance based on weights
-        feature_vector = self._prepare_feature_vector(features)
-        shap_values = {}
-        
-        risk_score = prediction.get('riskScore', 0.5)
-        total_contribution = risk_score - self.expected_value
-        
-        total_weight = sum(abs(self.feature_weights.get(name, 0.01)) for name in feature_vector.keys())
-        
-        for feature_name, value in feature_vector.items():
-            weight = self.feature_weights.get(feature_name, 0.01)
-            contribution = (value - 0.5) * weight * (total_contribution / total_weight) if total_weight > 0 else 0
-            shap_values[feature_name] = contribution
+        shap_values = self._as_feature_dict(self._calculate_approximate_shap(feature_vector, prediction))
+        feature_values = self._as_feature_dict(feature_vector)
         
         return {
             'shapValues': shap_values,
             'baseValue': self.expected_value,
             'expectedValue': self.expected_value,
             'featureNames': list(shap_values.keys()),
-            'featureValues': feature_vector,
+            'featureValues': feature_values,
             'modelType': 'fallback',
             'processingTime': 0.1,
             'error': error_msg,
@@ -562,11 +678,16 @@ class CognitiveShapExplainer:
         """
         Check health of SHAP environment
         """
+        if self._health_cache is not None:
+            return self._health_cache
+        
+        _lazy_import_pyplot()
+        
         health = {
             'available': True,
             'packages': {
                 'shap': SHAP_AVAILABLE,
-                'matplotlib': True,  # Always available since we import it
+                'matplotlib': True,  # Always available once pyplot is imported
                 'pandas': True,      # Assuming pandas is available
                 'numpy': True,       # Always available since we import it
                 'seaborn': SEABORN_AVAILABLE
@@ -580,8 +701,8 @@ class CognitiveShapExplainer:
                 'dependencePlots': True
             },
             'versions': {
-                'shap': shap.__version__ if SHAP_AVAILABLE else 'not available',
-                'matplotlib': matplotlib.__version__,
+                'shap': _SHAP_VERSION or 'not available',
+                'matplotlib': _MPL_VERSION,
                 'numpy': np.__version__
             }
         }
@@ -592,6 +713,7 @@ class CognitiveShapExplainer:
             health['packages']['numpy']
         ])
         
+        self._health_cache = health
         return health
 
 def main():
@@ -603,14 +725,14 @@ def main():
         if len(sys.argv) > 1 and sys.argv[1] == '--health-check':
             explainer = CognitiveShapExplainer()
             health = explainer.check_health()
-            print(json.dumps(health))
+            print(_dumps(health))
             return
         
         # Read input from command line arguments
         if len(sys.argv) < 2:
             raise ValueError("No input data provided")
         
-        input_data = json.loads(sys.argv[1])
+        input_data = _loads(sys.argv[1])
         features = input_data.get('features', {})
         prediction = input_data.get('prediction', {})
         options = input_data.get('options', {})
@@ -622,7 +744,7 @@ def main():
         result = explainer.generate_shap_explanation(features, prediction, options)
         
         # Output result as JSON
-        print(json.dumps(result))
+        print(_dumps(result))
         
     except Exception as e:
         # Return error result
@@ -642,7 +764,7 @@ def main():
                 'featureCount': 0
             }
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -13,6 +13,8 @@ const cognitiveModelRoutes = require('./routes/cognitiveModel');
 const explainabilityRoutes = require('./routes/explainability');
 const authRoutes = require('./routes/auth');
 const { errorHandler } = require('./middleware/errorHandler');
+const cognitiveModelService = require('./services/cognitiveModelService');
+const featureExtractionService = require('./services/featureExtractionService');
 
 const app = express();
 const PORT = process.env.PORT || 5000;
@@ -76,10 +78,22 @@ app.use('*', (req, res) => {
 app.use(errorHandler);
 
 // Start server
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log(`🚀 NeuroAid Backend Server running on port ${PORT}`);
   console.log(`📊 Health check: http://localhost:${PORT}/health`);
   console.log(`🌍 Environment: ${process.env.NODE_ENV || 'development'}`);
 });
 
+// Stop persistent Python workers with the server so they don't keep Node alive
+server.on('close', () => {
+  cognitiveModelService.shutdown();
+  featureExtractionService.shutdown();
+});
+
+for (const signal of ['SIGINT', 'SIGTERM']) {
+  process.once(signal, () => {
+    server.close(() => process.exit(0));
+  });
+}
+
 module.exports = app;
@@ -3,6 +3,16 @@ const path = require('path');
 const fs = require('fs-extra');
 const { v4: uuidv4 } = require('uuid');
 
+/**
+ * Terminate a PythonShell's child process if it is still running
+ */
+function killShell(shell) {
+  const child = shell.childProcess;
+  if (child && child.exitCode === null && child.signalCode === null && !child.killed) {
+    shell.kill();
+  }
+}
+
 class CognitiveModelService {
   constructor() {
     this.modelPath = path.join(__dirname, '../models');
@@ -59,6 +69,10 @@ class CognitiveModelService {
       moderate: 0.4,  // 40-69%
       high: 0.0       // Below 40%
     };
+    
+    // Persistent Python scorer process (spawned lazily, reused across requests)
+    this.scorerShell = null;
+    this.pendingScores = [];
   }
 
   /**
@@ -131,40 +145,91 @@ class CognitiveModelService {
     }
   }
 
+  /**
+   * Get the persistent Python scorer process, spawning it on first use.
+   * The worker loads the models once and answers one JSON line per request,
+   * in the order requests were sent.
+   */
+  getScorerShell() {
+    if (this.scorerShell) {
+      return this.scorerShell;
+    }
+
+    const shell = new PythonShell('cognitive_model_scorer.py', {
+      mode: 'json',
+      pythonPath: process.env.PYTHON_PATH || 'python3',
+      scriptPath: this.scriptsPath,
+      args: ['--serve', this.modelPath]
+    });
+
+    // Requests waiting on this process, answered in FIFO order
+    const pendingScores = [];
+    this.pendingScores = pendingScores;
+
+    shell.on('message', (result) => {
+      const pending = pendingScores.shift();
+      if (!pending) {
+        return;
+      }
+
+      if (!result || typeof result.riskScore !== 'number') {
+        pending.reject(new Error('Invalid model output format'));
+        return;
+      }
+
+      pending.resolve(result);
+    });
+
+    const handleExit = (err) => {
+      if (this.scorerShell === shell) {
+        this.scorerShell = null;
+      }
+
+      // Once dropped, the process must not outlive its reference
+      killShell(shell);
+
+      const message = err ? err.message : 'scorer process exited';
+      for (const { reject } of pendingScores.splice(0)) {
+        reject(new Error(`Python model execution failed: ${message}`));
+      }
+    };
+
+    shell.on('pythonError', handleExit);
+    shell.on('error', handleExit);
+    shell.on('close', () => handleExit());
+
+    this.scorerShell = shell;
+    return shell;
+  }
+
+  /**
+   * Stop the persistent scorer process, rejecting requests still waiting on it
+   */
+  shutdown() {
+    const shell = this.scorerShell;
+    this.scorerShell = null;
+
+    if (shell) {
+      killShell(shell);
+    }
+
+    for (const { reject } of this.pendingScores.splice(0)) {
+      reject(new Error('Python model execution failed: scorer shut down'));
+    }
+  }
+
   /**
    * Invoke primary ML model (Python-based ensemble)
    */
   async invokePrimaryModel(features, options) {
     return new Promise((resolve, reject) => {
-      const pythonOptions = {
-        mode: 'json',
-        pythonPath: process.env.PYTHON_PATH || 'python3',
-        scriptPath: this.scriptsPath,
-        args: [JSON.stringify({
-          features,
-          options,
-          modelPath: this.modelPath
-        })]
-      };
-
-      PythonShell.run('cognitive_model_scorer.py', pythonOptions, (err, results) => {
-        if (err) {
-          reject(new Error(`Python model execution failed: ${err.message}`));
-          return;
-        }
-
-        try {
-          const result = results[0];
-          if (!result || typeof result.riskScore !== 'number') {
-            reject(new Error('Invalid model output format'));
-            return;
-          }
-          
-          resolve(result);
-        } catch (parseError) {
-          reject(new Error(`Model result parsing failed: ${parseError.message}`));
-        }
-      });
+      try {
+        const shell = this.getScorerShell();
+        shell.send({ features, options });
+        this.pendingScores.push({ resolve, reject });
+      } catch (error) {
+        reject(new Error(`Python model execution failed: ${error.message}`));
+      }
     });
   }
 
@@ -6,6 +6,16 @@ const fs = require('fs-extra');
 const path = require('path');
 const { v4: uuidv4 } = require('uuid');
 
+/**
+ * Terminate a PythonShell's child process if it is still running
+ */
+function killShell(shell) {
+  const child = shell.childProcess;
+  if (child && child.exitCode === null && child.signalCode === null && !child.killed) {
+    shell.kill();
+  }
+}
+
 class FeatureExtractionService {
   constructor() {
     this.pythonPath = process.env.PYTHON_PATH || 'python3';
@@ -17,6 +27,10 @@ class FeatureExtractionService {
     // Initialize sentiment analyzer
     this.sentimentAnalyzer = new sentiment();
     
+    // Persistent Python NLP process (spawned lazily, reused across requests)
+    this.nlpShell = null;
+    this.pendingAnalyses = [];
+    
     // Initialize directories
     this.initializeDirectories();
   }
@@ -378,42 +392,94 @@ class FeatureExtractionService {
   }
 
   /**
-   * Extract advanced NLP features using Python/spaCy
+   * Get the persistent Python NLP process, spawning it on first use.
+   * The worker loads spaCy and NLTK once and answers one JSON line per
+   * request, in the order requests were sent.
    * @private
    */
-  async _extractAdvancedNLPFeatures(text, metadata = {}) {
-    return new Promise((resolve, reject) => {
-      const inputData = {
-        text,
-        metadata,
-        spacy_model: this.spacyModel
-      };
+  _getNLPShell() {
+    if (this.nlpShell) {
+      return this.nlpShell;
+    }
 
-      const options = {
-        mode: 'text',
-        pythonPath: this.pythonPath,
-        scriptPath: path.join(__dirname, '..', 'scripts'),
-        args: [JSON.stringify(inputData)]
-      };
+    const shell = new PythonShell('nlp_analyzer.py', {
+      mode: 'json',
+      pythonPath: this.pythonPath,
+      scriptPath: path.join(__dirname, '..', 'scripts')
+    });
 
-      PythonShell.run('nlp_analyzer.py', options, (err, results) => {
-        if (err) {
-          console.error('Python NLP analysis error:', err);
-          reject(new Error(`Advanced NLP analysis failed: ${err.message}`));
-          return;
-        }
+    // Requests waiting on this process, answered in FIFO order
+    const pendingAnalyses = [];
+    this.pendingAnalyses = pendingAnalyses;
 
-        try {
-          const result = JSON.parse(results[0]);
-          if (result.error) {
-            reject(new Error(result.error));
-          } else {
-            resolve(result);
-          }
-        } catch (parseError) {
-          reject(new Error(`Failed to parse NLP results: ${parseError.message}`));
-        }
-      });
+    shell.on('message', (result) => {
+      const pending = pendingAnalyses.shift();
+      if (!pending) {
+        return;
+      }
+
+      if (!result || result.error) {
+        pending.reject(new Error(result ? result.error : 'Empty NLP result'));
+        return;
+      }
+
+      pending.resolve(result);
+    });
+
+    const handleExit = (err) => {
+      if (this.nlpShell === shell) {
+        this.nlpShell = null;
+      }
+
+      // Once dropped, the process must not outlive its reference
+      killShell(shell);
+
+      const message = err ? err.message : 'NLP process exited';
+      for (const { reject } of pendingAnalyses.splice(0)) {
+        reject(new Error(`Advanced NLP analysis failed: ${message}`));
+      }
+    };
+
+    shell.on('pythonError', handleExit);
+    shell.on('error', handleExit);
+    shell.on('close', () => handleExit());
+
+    this.nlpShell = shell;
+    return shell;
+  }
+
+  /**
+   * Stop the persistent NLP process, rejecting requests still waiting on it
+   */
+  shutdown() {
+    const shell = this.nlpShell;
+    this.nlpShell = null;
+    if (shell) {
+      killShell(shell);
+    }
+
+    for (const { reject } of this.pendingAnalyses.splice(0)) {
+      reject(new Error('Advanced NLP analysis failed: NLP process shut down'));
+    }
+  }
+
+  /**
+   * Extract advanced NLP features using Python/spaCy
+   * @private
+   */
+  async _extractAdvancedNLPFeatures(text, metadata = {}) {
+    return new Promise((resolve, reject) => {
+      try {
+        const shell = this._getNLPShell();
+        shell.send({
+          text,
+          metadata,
+          spacy_model: this.spacyModel
+        });
+        this.pendingAnalyses.push({ resolve, reject });
+      } catch (error) {
+        reject(new Error(`Advanced NLP analysis failed: ${error.message}`));
+      }
     });
   }
 
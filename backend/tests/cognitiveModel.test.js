@@ -2,6 +2,7 @@ const request = require('supertest');
 const fs = require('fs-extra');
 const path = require('path');
 const app = require('../server');
+const cognitiveModelService = require('../services/cognitiveModelService');
 
 describe('Cognitive Model API', () => {
   const apiBase = '/api/cognitive-model';
@@ -51,6 +52,9 @@ describe('Cognitive Model API', () => {
   });
 
   afterAll(async () => {
+    // Stop the persistent scorer process so Jest can exit
+    cognitiveModelService.shutdown();
+
     // Cleanup test data
     try {
       const testFiles = await fs.readdir('./data/model-scores');
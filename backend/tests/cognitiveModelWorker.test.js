@@ -0,0 +1,134 @@
+// Fake PythonShell recording what the service sends to each spawned worker
+const mockShells = [];
+
+jest.mock('python-shell', () => {
+  const { EventEmitter } = require('events');
+
+  class PythonShell extends EventEmitter {
+    constructor(script, options) {
+      super();
+      this.script = script;
+      this.options = options;
+      this.sent = [];
+      this.childProcess = { exitCode: null, signalCode: null, killed: false };
+      this.kill = jest.fn(() => {
+        this.childProcess.killed = true;
+      });
+      mockShells.push(this);
+    }
+
+    send(message) {
+      this.sent.push(message);
+      return this;
+    }
+  }
+
+  return { PythonShell };
+});
+
+describe('Cognitive model scorer worker', () => {
+  let service;
+
+  beforeEach(() => {
+    mockShells.length = 0;
+    jest.isolateModules(() => {
+      service = require('../services/cognitiveModelService');
+    });
+  });
+
+  afterEach(() => {
+    service.shutdown();
+  });
+
+  it('should spawn one --serve worker and reuse it', async () => {
+    const first = service.invokePrimaryModel({ a: 1 }, {});
+    const second = service.invokePrimaryModel({ a: 2 }, {});
+
+    expect(mockShells).toHaveLength(1);
+    expect(mockShells[0].script).toBe('cognitive_model_scorer.py');
+    expect(mockShells[0].options.args[0]).toBe('--serve');
+
+    mockShells[0].emit('message', { riskScore: 0.1 });
+    mockShells[0].emit('message', { riskScore: 0.2 });
+    await Promise.all([first, second]);
+
+    expect(mockShells).toHaveLength(1);
+  });
+
+  it('should resolve concurrent requests in the order they were sent', async () => {
+    const requests = [1, 2, 3].map((i) => service.invokePrimaryModel({ i }, {}));
+    const shell = mockShells[0];
+
+    expect(shell.sent.map((message) => message.features.i)).toEqual([1, 2, 3]);
+
+    shell.emit('message', { riskScore: 0.1 });
+    shell.emit('message', { riskScore: 0.2 });
+    shell.emit('message', { riskScore: 0.3 });
+
+    const results = await Promise.all(requests);
+    expect(results.map((result) => result.riskScore)).toEqual([0.1, 0.2, 0.3]);
+  });
+
+  it('should reject only the request whose reply is malformed', async () => {
+    const first = service.invokePrimaryModel({ i: 1 }, {});
+    const second = service.invokePrimaryModel({ i: 2 }, {});
+
+    mockShells[0].emit('message', { error: 'bad input' });
+    mockShells[0].emit('message', { riskScore: 0.4 });
+
+    await expect(first).rejects.toThrow('Invalid model output format');
+    await expect(second).resolves.toEqual({ riskScore: 0.4 });
+  });
+
+  it('should reject every pending request when the worker crashes', async () => {
+    const requests = [1, 2, 3].map((i) => service.invokePrimaryModel({ i }, {}));
+    const shell = mockShells[0];
+
+    shell.emit('error', new Error('worker crashed'));
+
+    await Promise.all(requests.map((pending) =>
+      expect(pending).rejects.toThrow('Python model execution failed: worker crashed')
+    ));
+    expect(shell.kill).toHaveBeenCalled();
+    expect(service.scorerShell).toBeNull();
+  });
+
+  it('should respawn after a crash without the old worker affecting the new one', async () => {
+    const lost = service.invokePrimaryModel({ i: 1 }, {});
+    const oldShell = mockShells[0];
+    oldShell.emit('error', new Error('worker crashed'));
+    await expect(lost).rejects.toThrow('worker crashed');
+
+    const retried = service.invokePrimaryModel({ i: 2 }, {});
+    expect(mockShells).toHaveLength(2);
+    const newShell = mockShells[1];
+
+    // A late close from the crashed process must not reject the new request
+    oldShell.emit('close');
+    newShell.emit('message', { riskScore: 0.5 });
+
+    await expect(retried).resolves.toEqual({ riskScore: 0.5 });
+    expect(service.scorerShell).toBe(newShell);
+  });
+
+  it('should kill the worker and reject pending requests on shutdown', async () => {
+    const pending = service.invokePrimaryModel({ i: 1 }, {});
+    const shell = mockShells[0];
+
+    service.shutdown();
+
+    await expect(pending).rejects.toThrow('scorer shut down');
+    expect(shell.kill).toHaveBeenCalledTimes(1);
+    expect(service.scorerShell).toBeNull();
+  });
+
+  it('should not kill a worker that has already exited', () => {
+    service.invokePrimaryModel({ i: 1 }, {}).catch(() => {});
+    const shell = mockShells[0];
+    shell.childProcess.exitCode = 1;
+
+    shell.emit('close');
+
+    expect(shell.kill).not.toHaveBeenCalled();
+  });
+});
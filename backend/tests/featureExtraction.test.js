@@ -2,6 +2,7 @@ const request = require('supertest');
 const fs = require('fs-extra');
 const path = require('path');
 const app = require('../server');
+const featureExtractionService = require('../services/featureExtractionService');
 
 describe('Feature Extraction API', () => {
   const apiBase = '/api/feature-extraction';
@@ -15,6 +16,9 @@ describe('Feature Extraction API', () => {
   });
 
   afterAll(async () => {
+    // Stop the persistent NLP process so Jest can exit
+    featureExtractionService.shutdown();
+
     // Cleanup test data if needed
     try {
       const testFiles = await fs.readdir('./data/features');
@@ -0,0 +1,124 @@
+// Fake PythonShell recording what the service sends to each spawned worker
+const mockShells = [];
+
+jest.mock('python-shell', () => {
+  const { EventEmitter } = require('events');
+
+  class PythonShell extends EventEmitter {
+    constructor(script, options) {
+      super();
+      this.script = script;
+      this.options = options;
+      this.sent = [];
+      this.childProcess = { exitCode: null, signalCode: null, killed: false };
+      this.kill = jest.fn(() => {
+        this.childProcess.killed = true;
+      });
+      mockShells.push(this);
+    }
+
+    send(message) {
+      this.sent.push(message);
+      return this;
+    }
+  }
+
+  return { PythonShell };
+});
+
+describe('Feature extraction NLP worker', () => {
+  let service;
+
+  beforeEach(() => {
+    mockShells.length = 0;
+    jest.isolateModules(() => {
+      service = require('../services/featureExtractionService');
+    });
+  });
+
+  afterEach(() => {
+    service.shutdown();
+  });
+
+  it('should spawn one nlp_analyzer worker and reuse it', async () => {
+    const first = service._extractAdvancedNLPFeatures('First text.');
+    const second = service._extractAdvancedNLPFeatures('Second text.');
+
+    expect(mockShells).toHaveLength(1);
+    expect(mockShells[0].script).toBe('nlp_analyzer.py');
+
+    mockShells[0].emit('message', { basic_stats: { word_count: 2 } });
+    mockShells[0].emit('message', { basic_stats: { word_count: 2 } });
+    await Promise.all([first, second]);
+
+    expect(mockShells).toHaveLength(1);
+  });
+
+  it('should resolve concurrent requests in the order they were sent', async () => {
+    const texts = ['one', 'two', 'three'];
+    const requests = texts.map((text) => service._extractAdvancedNLPFeatures(text));
+    const shell = mockShells[0];
+
+    expect(shell.sent.map((message) => message.text)).toEqual(texts);
+
+    for (const text of texts) {
+      shell.emit('message', { text });
+    }
+
+    const results = await Promise.all(requests);
+    expect(results.map((result) => result.text)).toEqual(texts);
+  });
+
+  it('should reject only the request whose reply is an error', async () => {
+    const first = service._extractAdvancedNLPFeatures('bad');
+    const second = service._extractAdvancedNLPFeatures('good');
+
+    mockShells[0].emit('message', { error: 'Processing failed' });
+    mockShells[0].emit('message', { text: 'good' });
+
+    await expect(first).rejects.toThrow('Processing failed');
+    await expect(second).resolves.toEqual({ text: 'good' });
+  });
+
+  it('should reject every pending request when the worker crashes', async () => {
+    const requests = ['one', 'two', 'three'].map((text) => service._extractAdvancedNLPFeatures(text));
+    const shell = mockShells[0];
+
+    shell.emit('error', new Error('worker crashed'));
+
+    await Promise.all(requests.map((pending) =>
+      expect(pending).rejects.toThrow('Advanced NLP analysis failed: worker crashed')
+    ));
+    expect(shell.kill).toHaveBeenCalled();
+    expect(service.nlpShell).toBeNull();
+  });
+
+  it('should respawn after a crash without the old worker affecting the new one', async () => {
+    const lost = service._extractAdvancedNLPFeatures('lost');
+    const oldShell = mockShells[0];
+    oldShell.emit('error', new Error('worker crashed'));
+    await expect(lost).rejects.toThrow('worker crashed');
+
+    const retried = service._extractAdvancedNLPFeatures('retried');
+    expect(mockShells).toHaveLength(2);
+    const newShell = mockShells[1];
+
+    // A late close from the crashed process must not reject the new request
+    oldShell.emit('close');
+    newShell.emit('message', { text: 'retried' });
+
+    await expect(retried).resolves.toEqual({ text: 'retried' });
+    expect(service.nlpShell).toBe(newShell);
+  });
+
+  it('should kill the worker and reject pending requests on shutdown', async () => {
+    const pending = service._extractAdvancedNLPFeatures('pending');
+    const shell = mockShells[0];
+
+    service.shutdown();
+
+    await expect(pending).rejects.toThrow('NLP process shut down');
+    expect(shell.kill).toHaveBeenCalledTimes(1);
+    expect(service.nlpShell).toBeNull();
+  });
+});
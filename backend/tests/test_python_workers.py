@@ -0,0 +1,172 @@
+"""
+Checks for the persistent Python workers driven by the Node services
+
+Run with: python -m unittest discover -s tests -p 'test_*.py'
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+SPACY_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('spacy', 'nltk', 'textstat'))
+
+def vader_lexicon_available():
+    """Whether VADER's lexicon is installed; the worker downloads it otherwise, which fails offline"""
+    import nltk
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        return False
+    return True
+
+VADER_AVAILABLE = SPACY_AVAILABLE and vader_lexicon_available()
+
+# Fields that differ between two scorings of the same input
+VOLATILE_FIELDS = ('processingTime', 'timestamp')
+
+def run_worker(args, lines):
+    """Send request lines to a worker on stdin and return its parsed output lines"""
+    completed = subprocess.run(
+        [sys.executable] + args,
+        input=''.join(line + '\n' for line in lines),
+        capture_output=True,
+        text=True,
+        cwd=SCRIPTS_DIR,
+        timeout=300
+    )
+    assert completed.returncode == 0, completed.stderr
+    return [json.loads(line) for line in completed.stdout.splitlines()]
+
+def stable(result):
+    """Drop per-call timing fields so results can be compared"""
+    return {key: value for key, value in result.items() if key not in VOLATILE_FIELDS}
+
+@unittest.skipUnless(NUMPY_AVAILABLE, 'numpy is not installed')
+class CognitiveModelScorerWorkerTest(unittest.TestCase):
+    """cognitive_model_scorer.py --serve"""
+
+    FEATURES = {'wordCount': 0.4, 'typeTokenRatio': 0.7, 'hesitationRatio': 0.1}
+
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, SCRIPTS_DIR)
+        import cognitive_model_scorer
+        cls.scorer = cognitive_model_scorer.CognitiveModelScorer(MODELS_DIR)
+
+    def test_answers_one_line_per_request(self):
+        results = run_worker(['cognitive_model_scorer.py', '--serve', MODELS_DIR], [
+            json.dumps({'features': self.FEATURES}),
+            json.dumps({'batch': [self.FEATURES, {'wordCount': 0.2}]}),
+            json.dumps({'features': {'wordCount': 0.2}})
+        ])
+
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[1], list)
+        self.assertEqual(len(results[1]), 2)
+        self.assertEqual(stable(results[0]), stable(results[1][0]))
+        self.assertEqual(stable(results[2]), stable(results[1][1]))
+
+    def test_bad_line_does_not_stop_the_worker(self):
+        results = run_worker(['cognitive_model_scorer.py', '--serve', MODELS_DIR], [
+            'not json',
+            json.dumps({'features': self.FEATURES})
+        ])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['modelType'], 'error')
+        self.assertIn('error', results[0])
+        self.assertNotIn('error', results[1])
+        self.assertIsInstance(results[1]['riskScore'], float)
+
+    def test_score_batch_matches_score_features(self):
+        feature_dicts = [self.FEATURES, {'wordCount': 0.9}, self.FEATURES]
+        batch = self.scorer.score_batch(feature_dicts)
+
+        self.assertEqual(
+            [stable(result) for result in batch],
+            [stable(self.scorer.score_features(features)) for features in feature_dicts]
+        )
+
+    def test_score_batch_falls_back_per_item(self):
+        batch = self.scorer.score_batch([{'wordCount': 'x'}, self.FEATURES])
+
+        self.assertEqual(batch[0]['modelType'], 'fallback')
+        self.assertIn('error', batch[0])
+        self.assertEqual(stable(batch[1]), stable(self.scorer.score_features(self.FEATURES)))
+
+@unittest.skipUnless(SPACY_AVAILABLE, 'spaCy, NLTK or textstat is not installed')
+@unittest.skipUnless(VADER_AVAILABLE, 'NLTK vader_lexicon data is not installed')
+class NLPAnalyzerWorkerTest(unittest.TestCase):
+    """nlp_analyzer.py reading requests from stdin"""
+
+    TEXT = 'Mary went to Paris on Monday. Um, I forgot why. ' * 5
+
+    @classmethod
+    def setUpClass(cls):
+        import spacy
+
+        # Small rule-based pipeline so the check doesn't need a downloaded model
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+        ruler = nlp.add_pipe('entity_ruler')
+        ruler.add_patterns([
+            {'label': 'PERSON', 'pattern': 'Mary'},
+            {'label': 'GPE', 'pattern': 'Paris'},
+            {'label': 'DATE', 'pattern': 'Monday'}
+        ])
+
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.model = os.path.join(cls.tmpdir.name, 'model')
+        nlp.to_disk(cls.model)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def request(self, **fields):
+        return json.dumps({'spacy_model': self.model, **fields})
+
+    def test_answers_one_line_per_request(self):
+        results = run_worker(['nlp_analyzer.py'], [
+            self.request(text=self.TEXT),
+            'not json',
+            self.request(batch=[{'text': 'Mary walked.'}, {'text': 'Paris is big.'}]),
+            self.request(text='Mary walked.')
+        ])
+
+        self.assertEqual(len(results), 4)
+        self.assertIn('basic_stats', results[0])
+        self.assertEqual(results[1], {'error': 'Invalid JSON input'})
+        self.assertEqual(len(results[2]), 2)
+        self.assertEqual(results[2][0]['basic_stats'], results[3]['basic_stats'])
+
+    def test_detail_level(self):
+        counts, full = run_worker(['nlp_analyzer.py'], [
+            self.request(text=self.TEXT),
+            self.request(text=self.TEXT, detail_level='full')
+        ])
+
+        self.assertEqual(len(counts['named_entities']['entities']), 10)
+        self.assertEqual(len(full['named_entities']['entities']), 15)
+        self.assertEqual(counts['named_entities']['entity_type_counts'], full['named_entities']['entity_type_counts'])
+
+    def test_fast_mode(self):
+        full, fast = run_worker(['nlp_analyzer.py'], [
+            self.request(text=self.TEXT),
+            self.request(text=self.TEXT, fast=True)
+        ])
+
+        self.assertEqual(set(fast), {'readability_features', 'sentiment_analysis', 'metadata'})
+        self.assertEqual(fast['readability_features'], full['readability_features'])
+        self.assertEqual(fast['metadata']['language'], 'en')
+
+if __name__ == '__main__':
+    unittest.main()